@@ -4,8 +4,24 @@ import os
 import json
 import logging
 import time
+import types
 import base64
-from typing import List, Tuple, Type, Optional, Dict, Any
+import binascii
+import contextlib
+import functools
+import io
+import random
+import re
+import tempfile
+from typing import List, Tuple, Type, Optional, Dict, Any, Sequence, TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库json
+    orjson = None
+if TYPE_CHECKING:
+    import httpx
+    from aiohttp import web
 from src.chat.message_receive.message import MessageRecv
 from src.plugin_system import (
     BasePlugin,
@@ -18,15 +34,311 @@ from src.plugin_system import (
 logger = logging.getLogger("suno_ai")
 
 
+def _loads(raw: Any) -> Any:
+    """解析JSON，空内容返回None；安装了orjson时使用orjson"""
+    if not raw or not raw.strip():
+        return None
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(obj: Any) -> str:
+    """序列化为缩进格式的JSON字符串，用于日志输出"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _encode(obj: Any) -> bytes:
+    """序列化为紧凑的UTF-8 JSON请求体；安装了orjson时使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# 按3字节的整数倍分块编码，各块的base64结果可以直接拼接
+_BASE64_CHUNK_SIZE = 57 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _import_httpx():
+    """按需导入httpx，只在启用HTTP/2时才加载，未安装时返回None"""
+    try:
+        import httpx
+    except ImportError:  # httpx为可选依赖，用于HTTP/2连接复用，未安装时使用aiohttp
+        return None
+    return httpx
+
+
+def _read_file_base64(path: str) -> str:
+    """分块读取文件并编码为base64字符串，不在内存中保留完整的原始内容，供asyncio.to_thread在线程中调用"""
+    buf = io.BytesIO()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_BASE64_CHUNK_SIZE), b""):
+            buf.write(binascii.b2a_base64(chunk, newline=False))
+    return buf.getvalue().decode("ascii")
+
+
+def _remove_file(path: str):
+    """删除文件，文件不存在时忽略"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# 请求重试参数：仅对限流、服务端错误和网络异常重试，指数退避并加全抖动
+_RETRY_ATTEMPTS = 4
+_RETRY_START_TIMEOUT = 0.1
+_RETRY_MAX_TIMEOUT = 3.0
+_RETRY_FACTOR = 2.0
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 单次请求超时：总计60秒，连接5秒，两次读取间隔30秒
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=5, sock_read=30)
+
+# 可重试的网络异常，HTTP/2请求的httpx异常由_send_http2转换为对应的aiohttp异常
+_TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class _ConnectError(aiohttp.ClientConnectionError):
+    """HTTP/2请求在建立连接阶段失败，请求一定没有发出"""
+
+
+# 建立连接阶段的异常：请求尚未发出，非幂等请求（如提交生成任务）也可以安全重试；
+# aiohttp 3.10起连接超时单独抛出ConnectionTimeoutError
+_CONNECT_ERRORS = (aiohttp.ClientConnectorError, _ConnectError) + (
+    (aiohttp.ConnectionTimeoutError,) if hasattr(aiohttp, "ConnectionTimeoutError") else ()
+)
+# 非幂等请求只在限流时重试，5xx时服务端可能已经接受了任务
+_SAFE_RETRY_STATUSES = frozenset({429})
+# 计入熔断器失败次数的异常
+_BREAKER_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+# 文件下载：按64KB分块写入磁盘，总时长放宽到5分钟
+_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=5, sock_read=30)
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 下载时攒够该大小再写入磁盘
+_DOWNLOAD_WRITE_SIZE = 1024 * 1024
+
+# 支持的模型版本
+_SUPPORTED_MODELS = frozenset({"chirp-v3-0", "chirp-v3-5", "chirp-v4", "chirp-auk", "chirp-v5"})
+_DEFAULT_MODEL = "chirp-v4"
+
+# 批量查询接口暂时失败（5xx、400、响应无法解析等）后，这段时间内直接改为单独查询（秒）
+_BATCH_FETCH_COOLDOWN = 60.0
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 任务状态响应中各资源字段的候选字段名，按优先级排列
+_URL_FIELDS = (
+    "audio_url", "url", "song_url", "play_url", "download_url",
+    "audio", "audio_file", "file_url", "mp3_url", "mp3",
+    "song", "music_url", "music_file", "download", "play",
+)
+_ID_FIELDS = ("id", "clip_id", "clipId")
+
+# 输出字段 -> 候选字段名，由_extract统一提取
+_FIELD_MAP = {
+    "song_url": _URL_FIELDS,
+    "clip_id": _ID_FIELDS,
+    "image_url": ("image_url", "cover_url", "thumbnail_url"),
+    "lyrics": ("prompt", "lyrics", "text", "content"),
+    "title": ("title", "name", "display_name"),
+    "author": ("handle", "display_name", "author"),
+}
+
+# 资源可能所在的嵌套路径，按查找顺序排列；路径指向列表时只取其中第一个字典（第一个clip），
+# 避免歌曲、封面、标题等字段分别取自不同的clip
+_NEST_PATHS = (
+    ("clip",), ("clip", "clip"), ("clip", "audio"), ("clip", "result"),
+    ("audio",), ("audio", "clip"), ("audio", "audio"), ("audio", "result"),
+    ("result",), ("result", "clip"), ("result", "audio"), ("result", "result"),
+    ("data",), ("data", "clip"), ("data", "audio"), ("data", "result"),
+    ("audio_info",), ("audioInfo",),
+    ("results",), ("clips",),
+)
+
+# 从字符串中提取音频URL
+_URL_RE = re.compile(r'(https?://[^\s"\'<]+\.(?:mp3|wav|aac|flac|ogg))')
+
+# API任务状态到插件内部状态的映射
+_STATUS_MAP = {
+    "SUCCESS": "SUCCESS",
+    "FAILURE": "FAILED",
+    "IN_PROGRESS": "PROCESSING",
+    "QUEUED": "PROCESSING",
+    "SUBMITTED": "PROCESSING",
+    "NOT_START": "PROCESSING",
+}
+_TERMINAL_STATUSES = frozenset({"SUCCESS", "FAILED"})
+
+# 排队阶段的API状态，任务从排队进入生成时重置轮询间隔
+_QUEUED_STATUSES = frozenset({"QUEUED", "SUBMITTED", "NOT_START"})
+
+# 轮询间隔：前2次间隔1秒以尽快发现短任务，之后从2秒开始按1.5倍增长，最长30秒，实际等待时再加最多30%的随机抖动
+_POLL_INITIAL_DELAY = 1.0
+_POLL_FAST_ATTEMPTS = 2
+_POLL_BASE_DELAY = 2.0
+_POLL_FACTOR = 1.5
+_POLL_MAX_DELAY = 30.0
+_POLL_JITTER = 0.3
+
+# 共享轮询器的查询间隔：从0.5秒开始翻倍，最长5秒；有任务状态或进度变化、有新任务加入时恢复为0.5秒
+_WATCH_INITIAL_DELAY = 0.5
+_WATCH_MAX_DELAY = 5.0
+
+# 状态结果缺少data时使用的只读空映射，避免每次查询都新建一个空字典
+_EMPTY_DATA = types.MappingProxyType({})
+
+
+# URL首尾需要去除的空白和反引号
+_STRIP_CHARS = " `\t\n"
+
+
+def _clean_url(url: Optional[str]) -> Optional[str]:
+    """去除URL首尾的空白和反引号"""
+    return url.strip(_STRIP_CHARS) if url else url
+
+
+def _first(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """返回d中第一个非空的标量字段值"""
+    for k in keys:
+        v = d.get(k)
+        if v and not isinstance(v, (dict, list)):
+            return v
+    return None
+
+
+def _next_poll_delay(attempt: int) -> float:
+    """第attempt次轮询后建议的等待时间（秒）"""
+    if attempt < _POLL_FAST_ATTEMPTS:
+        return _POLL_INITIAL_DELAY
+    return min(_POLL_MAX_DELAY, _POLL_BASE_DELAY * _POLL_FACTOR ** min(attempt - _POLL_FAST_ATTEMPTS, 10))
+
+
+def _extract(d: Dict[str, Any], out: Dict[str, Any]) -> bool:
+    """按_FIELD_MAP从d中补全out里尚未取得的字段，全部取得时返回True"""
+    for key, aliases in _FIELD_MAP.items():
+        if key not in out:
+            value = _first(d, aliases)
+            if value:
+                out[key] = value
+    return len(out) == len(_FIELD_MAP)
+
+
+def _walk(d: Dict[str, Any], paths: Tuple[Tuple[str, ...], ...]):
+    """依次产出d本身以及paths中每条路径指向的字典，路径指向列表时产出其中第一个字典"""
+    yield d
+    for path in paths:
+        cur = d
+        for k in path:
+            cur = cur.get(k) if isinstance(cur, dict) else None
+            if cur is None:
+                break
+        if isinstance(cur, dict):
+            yield cur
+        elif isinstance(cur, list):
+            item = next((item for item in cur if isinstance(item, dict)), None)
+            if item is not None:
+                yield item
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，请求被直接拒绝"""
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """调用方传入的截止时间已到，不代表端点故障，不计入熔断器失败次数"""
+
+
+class _CircuitBreaker:
+    """简单熔断器：CLOSED -> OPEN -> HALF_OPEN
+    
+    连续失败fail_max次后打开，reset_timeout秒内直接拒绝请求；
+    之后进入半开状态只放行一个试探请求，试探结束前其余请求仍被拒绝，
+    试探成功则关闭，失败则重新打开。
+    """
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+        # 半开状态下是否已有试探请求在进行
+        self._probe_inflight = False
+    
+    def is_open(self) -> bool:
+        """判断是否应拒绝请求，超过reset_timeout后转为半开并只放行第一个请求作为试探"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return True
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_inflight:
+                return True
+            self._probe_inflight = True
+        return False
+    
+    def release_probe(self):
+        """试探请求没有得到结果（如被取消）时释放试探名额，保持半开状态"""
+        self._probe_inflight = False
+    
+    def record_success(self):
+        self._probe_inflight = False
+        self.failure_count = 0
+        self.state = self.CLOSED
+    
+    def record_failure(self):
+        self._probe_inflight = False
+        self.failure_count += 1
+        if self.state == self.HALF_OPEN or self.failure_count >= self.fail_max:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+# 按 API地址+端点 划分的熔断器，跨客户端实例共享，避免一个端点故障影响其他端点
+_circuit_breakers: Dict[str, _CircuitBreaker] = {}
+
+
+class _BufferedResponse:
+    """已读取完响应体的响应，连接释放后仍可调用read()/text()
+    
+    aiohttp的响应离开async with后连接已释放，再调用read()会抛出ClientConnectionError，
+    因此_send_with_retry在连接释放前读取响应体，aiohttp和httpx的响应都转换为本类。
+    """
+    
+    def __init__(self, status: int, headers: Any, body: bytes, charset: Optional[str] = None):
+        self.status = status
+        self.ok = status < 400
+        self.headers = headers
+        self._body = body
+        self._charset = charset or "utf-8"
+    
+    async def read(self) -> bytes:
+        return self._body
+    
+    async def text(self) -> str:
+        return self._body.decode(self._charset, errors="replace")
+
+
 class SunoAIClient:
     """Suno AI API客户端 - 支持Vector Engine API"""
-    def __init__(self, cookie: str, api_base: str = "https://api.vectorengine.ai", api_key: str = ""):
+    def __init__(self, cookie: str, api_base: str = "https://api.vectorengine.ai", api_key: str = "", max_inflight: int = 8, use_http2: bool = False, connector: Optional[aiohttp.BaseConnector] = None):
         self.cookie = cookie
         self.api_base = api_base
         self.api_key = api_key
+        self.max_inflight = max(1, int(max_inflight))
+        if use_http2 and _import_httpx() is None:
+            logger.warning("未安装httpx，无法启用HTTP/2，回退到aiohttp")
+        self.use_http2 = bool(use_http2) and _import_httpx() is not None
         self.headers = {
             "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "User-Agent": _USER_AGENT,
         }
         
         # 添加API密钥认证
@@ -34,8 +346,252 @@ class SunoAIClient:
             self.headers.update({
                 "Authorization": f"Bearer {api_key}"
             })
+        
+        # 共享会话，首次请求时创建，复用连接池避免每次请求重新握手
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 下载音频/图片使用独立会话，避免把API密钥发送给第三方文件服务器
+        self._download_session: Optional[aiohttp.ClientSession] = None
+        # 外部传入的连接池（如插件级共享连接池），会话关闭时不关闭该连接池
+        self._connector = connector
+        # 启用HTTP/2时API请求在单个连接上多路复用，由httpx客户端发送
+        self._http2_client: Optional["httpx.AsyncClient"] = None
+        
+        # 限制同时进行的API请求数量，避免突发请求压垮后端
+        self._sem = asyncio.Semaphore(self.max_inflight)
+        
+        # 正在进行中的任务状态查询，同一task_id的并发查询共享一次请求
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # API是否支持批量查询任务状态，None表示尚未探测
+        self._supports_batch_fetch: Optional[bool] = None
+        # 批量查询暂时失败后，在此time.monotonic()时间之前不再尝试批量接口
+        self._batch_retry_at = 0.0
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的ClientSession，不存在或已关闭时创建"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=self._connector or aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=self.max_inflight,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                ),
+                connector_owner=self._connector is None,
+            )
+        return self._session
+    
+    def _get_http2_client(self) -> Optional["httpx.AsyncClient"]:
+        """获取HTTP/2客户端，缺少h2依赖时关闭HTTP/2并返回None"""
+        if self._http2_client is None or self._http2_client.is_closed:
+            httpx = _import_httpx()
+            try:
+                self._http2_client = httpx.AsyncClient(
+                    http2=True,
+                    headers=self.headers,
+                    # 并发请求数已由_sem限制为max_inflight，连接数上限与之一致
+                    limits=httpx.Limits(max_connections=self.max_inflight, max_keepalive_connections=self.max_inflight),
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                )
+            except ImportError:
+                logger.warning("未安装h2，无法启用HTTP/2，回退到aiohttp（可通过 pip install httpx[http2] 安装）")
+                self.use_http2 = False
+                return None
+        return self._http2_client
+    
+    async def _get_download_session(self) -> aiohttp.ClientSession:
+        """获取用于下载文件的ClientSession，只携带User-Agent和Cookie"""
+        if self._download_session is None or self._download_session.closed:
+            self._download_session = aiohttp.ClientSession(
+                headers={"User-Agent": _USER_AGENT, "Cookie": self.cookie},
+                connector=self._connector or aiohttp.TCPConnector(limit=self.max_inflight, ttl_dns_cache=300),
+                connector_owner=self._connector is None,
+            )
+        return self._download_session
+    
+    async def close(self):
+        """关闭共享会话，取消尚未完成的任务状态查询"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        for session in (self._session, self._download_session):
+            if session is not None and not session.closed:
+                await session.close()
+        if self._http2_client is not None and not self._http2_client.is_closed:
+            await self._http2_client.aclose()
+        self._session = None
+        self._download_session = None
+        self._http2_client = None
+    
+    async def __aenter__(self) -> "SunoAIClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_circuit_breaker(self, endpoint: str) -> _CircuitBreaker:
+        """获取指定端点的熔断器"""
+        key = f"{self.api_base}:{endpoint}"
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = _circuit_breakers[key] = _CircuitBreaker()
+        return breaker
+    
+    async def _request_with_retry(self, method: str, url: str, endpoint: str, deadline: Optional[float] = None, idempotent: bool = True, retry: bool = True, **kwargs) -> _BufferedResponse:
+        """发送请求，对瞬时错误进行指数退避重试，并经过端点熔断器
+        
+        仅重试429/5xx状态码和网络异常，其余4xx（如认证失败）直接返回。
+        返回的响应已读取完响应体，可在连接释放后继续调用read()/text()。
+        
+        Args:
+            endpoint: 端点名称（如submit、fetch、wav），用于区分熔断器
+            deadline: 整个请求（含重试）的截止时间，time.monotonic()时间戳，超过后抛出DeadlineExceededError
+            idempotent: 请求是否可以重复发送；为False时（如提交付费的生成任务）只在建立连接失败和429时重试，
+                避免超时或5xx后服务端其实已接受任务时重复提交
+            retry: 为False时只发送一次，不做任何重试（如探测接口是否存在）
+        
+        Raises:
+            CircuitOpenError: 端点熔断器处于打开状态
+            DeadlineExceededError: 超过deadline，不计入熔断器失败次数
+        """
+        breaker = self._get_circuit_breaker(endpoint)
+        if breaker.is_open():
+            raise CircuitOpenError(f"端点 {endpoint} 已熔断，暂停请求")
+        try:
+            response = await self._send_with_retry(method, url, deadline, idempotent, retry, **kwargs)
+        except DeadlineExceededError:
+            breaker.release_probe()
+            raise
+        except _BREAKER_ERRORS:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        if response.status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+    
+    async def _send_with_retry(self, method: str, url: str, deadline: Optional[float] = None, idempotent: bool = True, retry: bool = True, **kwargs) -> _BufferedResponse:
+        """_request_with_retry的重试实现"""
+        base_timeout = kwargs.pop("timeout", _DEFAULT_TIMEOUT)
+        retry_errors = _TRANSIENT_ERRORS if idempotent else _CONNECT_ERRORS
+        retry_statuses = _RETRY_STATUSES if idempotent else _SAFE_RETRY_STATUSES
+        attempts = _RETRY_ATTEMPTS if retry else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            timeout = base_timeout
+            clipped = False  # 本次超时是否被截止时间缩短
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceededError("请求超过截止时间")
+                if timeout.total is None or remaining < timeout.total:
+                    timeout = aiohttp.ClientTimeout(total=remaining, connect=timeout.connect, sock_read=timeout.sock_read)
+                    clipped = True
+            try:
+                async with self._sem:
+                    if self.use_http2 and self._get_http2_client() is not None:
+                        response = await self._send_http2(method, url, timeout, **kwargs)
+                    else:
+                        session = await self._get_session()
+                        async with session.request(method, url, timeout=timeout, **kwargs) as resp:
+                            # 连接释放前读取响应体
+                            response = _BufferedResponse(resp.status, resp.headers, await resp.read(), resp.charset)
+            except retry_errors + (asyncio.TimeoutError,) as e:
+                if clipped and isinstance(e, asyncio.TimeoutError) and time.monotonic() >= deadline:
+                    # 因截止时间缩短的超时属于调用方的截止时间到期，而非端点超时
+                    raise DeadlineExceededError("请求超过截止时间") from e
+                if last_attempt or not isinstance(e, retry_errors):
+                    raise
+                logger.warning("请求异常，准备重试(%s/%s): %s", attempt + 1, _RETRY_ATTEMPTS - 1, e)
+            else:
+                # HTML页面通常是地址配置错误，重试没有意义
+                if (response.status not in retry_statuses or last_attempt
+                        or "text/html" in response.headers.get("Content-Type", "")):
+                    return response
+                logger.warning("请求返回状态码 %s，准备重试(%s/%s)", response.status, attempt + 1, _RETRY_ATTEMPTS - 1)
+            
+            delay = min(_RETRY_MAX_TIMEOUT, _RETRY_START_TIMEOUT * _RETRY_FACTOR ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+    
+    async def _send_http2(self, method: str, url: str, timeout: aiohttp.ClientTimeout, **kwargs) -> _BufferedResponse:
+        """通过httpx客户端发送单次请求，超时参数沿用aiohttp.ClientTimeout
+        
+        httpx建立连接阶段的异常转换为_ConnectError，其余传输异常转换为aiohttp.ClientConnectionError，
+        其余请求异常转换为aiohttp.ClientError，
+        重试和熔断逻辑无需区分两种客户端。
+        """
+        httpx = _import_httpx()
+        if "data" in kwargs:
+            # httpx中原始字节请求体使用content参数
+            kwargs["content"] = kwargs.pop("data")
+        try:
+            response = await self._http2_client.request(
+                method, url,
+                timeout=httpx.Timeout(timeout.total, connect=timeout.connect, read=timeout.sock_read),
+                **kwargs,
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            raise _ConnectError(str(e)) from e
+        except httpx.TransportError as e:
+            raise aiohttp.ClientConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise aiohttp.ClientError(str(e)) from e
+        return _BufferedResponse(response.status_code, response.headers, response.content, response.encoding)
+    
+    async def _log_response(self, url: str, response: Any):
+        """记录响应状态码，DEBUG级别下额外记录响应内容（最多2048字符）"""
+        logger.info("API响应状态码: %s (%s)", response.status, url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API响应内容: %.2048s", await response.text())
+    
+    async def _call(self, method: str, url: str, endpoint: str, action: str, payload: Any = None) -> Dict[str, Any]:
+        """发送API请求并解析统一格式（code/data/message）的响应
+        
+        POST请求（提交生成任务、上传相关操作）按非幂等请求发送，不会因超时或5xx被重复提交。
+        
+        Args:
+            endpoint: 端点名称，用于区分熔断器
+            action: 操作名称，用于日志（如"生成歌词"）
+            payload: JSON请求体，为None时不发送请求体
+            
+        Returns:
+            Dict: {"success": 是否成功, "data": 响应中的data字段, "error": 错误信息, "code": HTTP状态码（没有响应时为None）}
+        """
+        logger.info("发送Suno API请求: %s", url)
+        kwargs = {}
+        if payload is not None:
+            logger.info("请求参数: %s", payload)
+            kwargs["data"] = _encode(payload)
+        
+        try:
+            response = await self._request_with_retry(method, url, endpoint, idempotent=method == "GET", **kwargs)
+            await self._log_response(url, response)
+            
+            if response.status != 200:
+                logger.error("%s请求失败，状态码: %s", action, response.status)
+                return {"success": False, "data": None, "error": f"HTTP_{response.status}", "code": response.status}
+            try:
+                data = _loads(await response.read())
+            except json.JSONDecodeError as e:
+                logger.error("%s失败: 解析JSON响应失败: %s", action, e)
+                return {"success": False, "data": None, "error": "JSON_DECODE_ERROR", "code": response.status}
+        except Exception as e:
+            # 请求和读取响应体时的网络异常（aiohttp.ClientError）、超时和端点熔断都转换为失败结果
+            logger.error("%s异常: %s", action, e)
+            return {"success": False, "data": None, "error": str(e), "code": None}
+        if not isinstance(data, dict):
+            logger.error("%s失败: 无效的响应格式", action)
+            return {"success": False, "data": None, "error": "INVALID_RESPONSE_FORMAT", "code": response.status}
+        if data.get("code") != "success":
+            logger.error("%s失败: %s", action, data.get("message"))
+            return {"success": False, "data": None, "error": data.get("message"), "code": response.status}
+        return {"success": True, "data": data.get("data"), "error": None, "code": response.status}
     
-    async def generate_song(self, prompt: str, style: str = "", title: str = "", music_type: str = "song", model: str = "chirp-v4", continue_at: float = 0.0, continue_clip_id: str = "", task_id: str = "", notify_hook: str = "") -> Optional[str]:
+    async def generate_song(self, prompt: str, style: str = "", title: str = "", music_type: str = "song", model: str = _DEFAULT_MODEL, continue_at: float = 0.0, continue_clip_id: str = "", task_id: str = "", notify_hook: str = "") -> Optional[str]:
         """生成歌曲 - 使用Vector Engine API
         
         Args:
@@ -55,10 +611,9 @@ class SunoAIClient:
         url = f"{self.api_base}/suno/submit/music"
         
         # 检查模型是否在支持列表中
-        supported_models = ["chirp-v3-0", "chirp-v3-5", "chirp-v4", "chirp-auk", "chirp-v5"]
-        if model not in supported_models:
-            model = "chirp-v4"  # 默认使用最新模型
-            logger.warning(f"模型 {model} 不在支持列表中，使用默认模型 chirp-v4")
+        if model not in _SUPPORTED_MODELS:
+            logger.warning("模型 %s 不在支持列表中，使用默认模型 %s", model, _DEFAULT_MODEL)
+            model = _DEFAULT_MODEL
         
         # 确保必填字段
         if not prompt:
@@ -76,376 +631,262 @@ class SunoAIClient:
             "tags": style,  # 风格标签，多个标签用半角逗号分隔，可选
             "make_instrumental": music_type == "pure_music",  # 是否生成纯音乐版本
             "gpt_description_prompt": prompt,  # 创作描述提示词，仅用于灵感模式，必需
+            # 续写相关参数、任务ID和回调通知地址仅在提供时添加
+            **({"continue_at": continue_at, "continue_clip_id": continue_clip_id} if continue_clip_id else {}),
+            **({"task_id": task_id} if task_id else {}),
+            **({"notify_hook": notify_hook} if notify_hook else {}),
         }
         
-        # 添加续写相关参数（如果提供）
         if continue_clip_id:
-            payload["continue_at"] = continue_at
-            payload["continue_clip_id"] = continue_clip_id
-            logger.info(f"使用续写模式生成歌曲，续写歌曲ID: {continue_clip_id}，续写时间点: {continue_at}")
-        
-        # 添加任务ID（如果提供）
+            logger.info("使用续写模式生成歌曲，续写歌曲ID: %s，续写时间点: %s", continue_clip_id, continue_at)
         if task_id:
-            payload["task_id"] = task_id
-            logger.info(f"使用任务ID: {task_id} 进行操作")
-        
-        # 添加回调通知地址（如果提供）
+            logger.info("使用任务ID: %s 进行操作", task_id)
         if notify_hook:
-            payload["notify_hook"] = notify_hook
-            logger.info(f"设置回调通知地址: {notify_hook}")
+            logger.info("设置回调通知地址: %s", notify_hook)
         
-        logger.info(f"使用生成模式生成歌曲，模型: {model}")
+        logger.info("使用生成模式生成歌曲，模型: %s", model)
         if music_type == "pure_music":
             logger.info("生成纯音乐")
         
-        # 确保必填参数存在
-        if not payload.get("mv"):
-            payload["mv"] = "chirp-v4"
-        
-        if not payload.get("gpt_description_prompt"):
-            payload["gpt_description_prompt"] = "一首动听的歌曲"
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                logger.info(f"请求参数: {payload}")
-                async with session.post(url, headers=self.headers, json=payload) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, dict):
-                            if data.get("code") == "success":
-                                # 返回task_id
-                                return data["data"]
-                            else:
-                                logger.error(f"生成歌曲失败: {data.get('message')}")
-                        else:
-                            logger.error(f"生成歌曲失败: 无效的响应格式")
-                    else:
-                        logger.error(f"生成歌曲请求失败，状态码: {response.status}")
-                        logger.error(f"响应内容: {response_text}")
-        except Exception as e:
-            logger.error(f"生成歌曲异常: {str(e)}")
-        return None
+        result = await self._call("POST", url, "submit", "生成歌曲", payload)
+        # 成功时data为task_id
+        return result["data"] if result["success"] else None
     
-    async def get_task_status(self, task_id: str) -> Dict[str, Any]:
+    async def get_task_status(self, task_id: str, deadline: Optional[float] = None, attempt: int = 0) -> Dict[str, Any]:
         """查询单个任务状态 - 使用Vector Engine API
         
+        同一task_id已有查询在进行时，直接等待该查询的结果而不重复请求。
+        
         Args:
             task_id: 任务ID
+            deadline: 查询的截止时间，time.monotonic()时间戳
+            attempt: 调用方已轮询的次数（含本次查询），用于计算返回的retry_after
             
         Returns:
-            Dict: 包含任务状态的字典
+            Dict: 包含任务状态的字典，data.retry_after为建议的下次轮询间隔（秒），终态时为0；
+                失败时retryable表示错误是否可能在重试后恢复，code为HTTP状态码（没有响应时为None）
         """
+        task = self._inflight.get(task_id)
+        if task is None:
+            # 查询在独立的任务中运行，发起查询的调用方被取消时不影响其他等待同一结果的调用方
+            task = asyncio.ensure_future(self._fetch_task_status(task_id, deadline, attempt))
+            self._inflight[task_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(task_id, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch_task_status(self, task_id: str, deadline: Optional[float] = None, attempt: int = 0) -> Dict[str, Any]:
+        """get_task_status的实际请求实现"""
         # 使用新的API路径格式，task_id作为路径参数
         url = f"{self.api_base}/suno/fetch/{task_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                async with session.get(url, headers=self.headers) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")  # 记录完整响应内容，以便调试
-                    
-                    if response.status == 200:
-                        # 检查响应内容类型
-                        content_type = response.headers.get("Content-Type", "")
-                        if "text/html" in content_type:
-                            # 处理HTML响应，这通常是API网关错误或重定向
-                            logger.error(f"获取任务状态失败: API返回了HTML页面而不是JSON响应")
-                            logger.error(f"请检查API地址是否正确，或尝试使用不同的API基础地址")
-                            return {"success": False, "error": "HTML_RESPONSE"}
-                        
-                        try:
-                            data = await response.json()
-                            if isinstance(data, dict):
-                                if data.get("code") == "success":
-                                    task_data = data.get("data", {})
-                                    status = task_data.get("status", "PROCESSING")
-                                    
-                                    # 转换状态映射
-                                    status_mapping = {
-                                        "SUCCESS": "SUCCESS",
-                                        "FAILURE": "FAILED",
-                                        "IN_PROGRESS": "PROCESSING",
-                                        "QUEUED": "PROCESSING",
-                                        "SUBMITTED": "PROCESSING",
-                                        "NOT_START": "PROCESSING"
-                                    }
-                                    
-                                    mapped_status = status_mapping.get(status, "PROCESSING")
-                                    
-                                    # 尝试从不同字段获取歌曲URL
-                                    song_url = None
-                                    
-                                    # 扩展URL字段列表，增加更多可能的字段名
-                                    potential_url_fields = [
-                                        "audio_url", "url", "song_url", "play_url", "download_url",
-                                        "audio", "audio_file", "file_url", "mp3_url", "mp3",
-                                        "song", "music_url", "music_file", "download", "play"
-                                    ]
-                                    
-                                    # 处理两种可能的响应格式
-                                    clip_id = None
-                                    clip = {}
-                                    
-                                    # 情况1：task_data是字符串（直接是clip_id）
-                                    if isinstance(task_data, str):
-                                        clip_id = task_data
-                                        # 如果是字符串，尝试解析为JSON
-                                        try:
-                                            task_data_json = json.loads(task_data)
-                                            if isinstance(task_data_json, dict):
-                                                task_data = task_data_json
-                                            elif isinstance(task_data_json, list) and task_data_json:
-                                                task_data = task_data_json[0]
-                                        except (json.JSONDecodeError, TypeError):
-                                            pass
-                                    
-                                    # 情况2：task_data是字典
-                                    if isinstance(task_data, dict):
-                                        # 尝试获取clip_id
-                                        clip_id = task_data.get("id") or task_data.get("clip_id") or task_data.get("clipId")
-                                        
-                                        # 记录task_data结构，便于调试
-                                        logger.info(f"task_data结构: {json.dumps(task_data, ensure_ascii=False, indent=2)}")
-                                        
-                                        # 尝试从task_data直接获取URL
-                                        for field in potential_url_fields:
-                                            if task_data.get(field):
-                                                song_url = task_data.get(field)
-                                                logger.info(f"从task_data直接获取到URL: {song_url}")
-                                                break
-                                        
-                                        # 检查嵌套结构
-                                        if not song_url:
-                                            # 检查clip或audio字段中的URL
-                                            for nested_key in ["clip", "audio", "result", "data"]:
-                                                nested = task_data.get(nested_key, {})
-                                                if isinstance(nested, dict):
-                                                    # 从嵌套结构获取clip_id
-                                                    clip_id = clip_id or nested.get("id") or nested.get("clip_id") or nested.get("clipId")
-                                                    # 从嵌套结构获取URL
-                                                    for field in potential_url_fields:
-                                                        if nested.get(field):
-                                                            song_url = nested.get(field)
-                                                            logger.info(f"从{nested_key}获取到URL: {song_url}")
-                                                            break
-                                                    if song_url:
-                                                        break
-                                                    
-                                                    # 检查嵌套结构中的嵌套结构
-                                                    for deep_key in ["clip", "audio", "result"]:
-                                                        deep_nested = nested.get(deep_key, {})
-                                                        if isinstance(deep_nested, dict):
-                                                            # 从深层嵌套结构获取clip_id
-                                                            clip_id = clip_id or deep_nested.get("id") or deep_nested.get("clip_id") or deep_nested.get("clipId")
-                                                            # 从深层嵌套结构获取URL
-                                                            for field in potential_url_fields:
-                                                                if deep_nested.get(field):
-                                                                    song_url = deep_nested.get(field)
-                                                                    logger.info(f"从{nested_key}.{deep_key}获取到URL: {song_url}")
-                                                                    break
-                                                            if song_url:
-                                                                break
-                                                    if song_url:
-                                                        break
-                                        
-                                        # 检查audio_info或similar字段
-                                        if not song_url:
-                                            audio_info = task_data.get("audio_info", {}) or task_data.get("audioInfo", {})
-                                            if isinstance(audio_info, dict):
-                                                for field in potential_url_fields:
-                                                    if audio_info.get(field):
-                                                        song_url = audio_info.get(field)
-                                                        logger.info(f"从audio_info获取到URL: {song_url}")
-                                                        break
-                                        
-                                        # 检查results列表
-                                        if not song_url:
-                                            results = task_data.get("results", []) or task_data.get("clips", [])
-                                            if isinstance(results, list):
-                                                for item in results:
-                                                    if isinstance(item, dict):
-                                                        # 从results列表获取clip_id
-                                                        clip_id = clip_id or item.get("id") or item.get("clip_id") or item.get("clipId")
-                                                        # 从results列表获取URL
-                                                        for field in potential_url_fields:
-                                                            if item.get(field):
-                                                                song_url = item.get(field)
-                                                                logger.info(f"从results列表获取到URL: {song_url}")
-                                                                break
-                                                    if song_url:
-                                                        break
-                                    
-                                    # 如果还是没有找到URL，尝试从raw_data中提取
-                                    if not song_url and isinstance(task_data, str):
-                                        import re
-                                        # 使用正则表达式从字符串中提取URL
-                                        url_pattern = r'(https?://[^\s"\'<]+\.(mp3|wav|aac|flac|ogg))'
-                                        matches = re.findall(url_pattern, task_data)
-                                        if matches:
-                                            song_url = matches[0][0]  # 获取完整URL，而不仅仅是文件扩展名
-                                            logger.info(f"从字符串中提取到URL: {song_url}")
-                                    
-                                    # 最后的尝试：如果有clip_id，构造一个可能的URL
-                                    if not song_url and clip_id:
-                                        # 尝试构造Suno官方URL格式
-                                        possible_urls = [
-                                            f"https://app.suno.ai/api/clips/{clip_id}/audio",
-                                            f"https://app.suno.ai/api/v1/clips/{clip_id}/audio",
-                                            f"https://cdn.suno.ai/{clip_id}.mp3"
-                                        ]
-                                        # 记录可能的URL，便于调试
-                                        logger.info(f"构造可能的URL列表: {possible_urls}")
-                                        # 这里不直接设置song_url，因为这些是猜测的URL
-                                    
-                                    # 提取其他资源信息
-                                    image_url = None
-                                    lyrics = None
-                                    title = None  # 初始化为None，确保在所有情况下都有定义
-                                    author = None  # 初始化为None，确保在所有情况下都有定义
-                                    
-                                    # 首先检查task_data是否直接包含资源信息（用户提供的最新响应格式）
-                                    if isinstance(task_data, dict):
-                                        # 检查是否直接包含资源字段
-                                        if "audio_url" in task_data or "image_url" in task_data or "prompt" in task_data:
-                                            # 直接从task_data提取资源
-                                            logger.info("直接从task_data提取资源信息")
-                                            # 提取song_url
-                                            if not song_url:
-                                                for field in potential_url_fields:
-                                                    if task_data.get(field):
-                                                        song_url = task_data.get(field)
-                                                        logger.info(f"从task_data直接获取到URL: {song_url}")
-                                                        break
-                                            # 提取image_url
-                                            image_url = task_data.get("image_url") or task_data.get("cover_url") or task_data.get("thumbnail_url")
-                                            # 提取lyrics（prompt字段包含歌词）
-                                            lyrics = task_data.get("prompt") or task_data.get("lyrics") or task_data.get("text") or task_data.get("content")
-                                            # 提取title
-                                            title = task_data.get("title") or task_data.get("name") or task_data.get("display_name")
-                                            # 提取author
-                                            author = task_data.get("handle") or task_data.get("display_name") or task_data.get("author")
-                                            # 提取clip_id
-                                            if not clip_id:
-                                                clip_id = task_data.get("id") or task_data.get("clip_id") or task_data.get("clipId")
-                                        else:
-                                            # 处理results、clips或data列表中的资源
-                                            # 检查多种可能的列表字段名
-                                            resource_list = task_data.get("data", []) or task_data.get("results", []) or task_data.get("clips", [])
-                                            if isinstance(resource_list, list) and resource_list:
-                                                # 获取第一个结果项
-                                                result_item = resource_list[0]
-                                                if isinstance(result_item, dict):
-                                                    logger.info(f"从data列表提取资源信息")
-                                                    # 提取image_url
-                                                    image_url = result_item.get("image_url") or result_item.get("cover_url") or result_item.get("thumbnail_url")
-                                                    # 提取lyrics（prompt字段包含歌词）
-                                                    lyrics = result_item.get("prompt") or result_item.get("lyrics") or result_item.get("text") or result_item.get("content")
-                                                    # 提取title
-                                                    title = result_item.get("title") or result_item.get("name") or result_item.get("display_name")
-                                                    # 提取author
-                                                    author = result_item.get("handle") or result_item.get("display_name") or result_item.get("author")
-                                                    # 如果song_url为空，尝试从结果项获取
-                                                    if not song_url:
-                                                        for field in potential_url_fields:
-                                                            if result_item.get(field):
-                                                                song_url = result_item.get(field)
-                                                                logger.info(f"从列表项获取到URL: {song_url}")
-                                                                break
-                                                    # 如果clip_id为空，尝试从结果项获取
-                                                    if not clip_id:
-                                                        clip_id = result_item.get("id") or result_item.get("clip_id") or result_item.get("clipId")
-                                            else:
-                                                # 从嵌套结构提取
-                                                logger.info("从嵌套结构提取资源信息")
-                                                # 直接从task_data提取
-                                                if not image_url:
-                                                    image_url = task_data.get("image_url") or task_data.get("cover_url") or task_data.get("thumbnail_url")
-                                                if not lyrics:
-                                                    lyrics = task_data.get("prompt") or task_data.get("lyrics") or task_data.get("text") or task_data.get("content")
-                                                if not title:
-                                                    title = task_data.get("title") or task_data.get("name") or task_data.get("display_name")
-                                                if not author:
-                                                    author = task_data.get("handle") or task_data.get("display_name") or task_data.get("author")
-                                                if not clip_id:
-                                                    clip_id = task_data.get("id") or task_data.get("clip_id") or task_data.get("clipId")
-                                                
-                                                # 从更深层的嵌套结构提取
-                                                if not image_url or not lyrics or not title or not author or not clip_id or not song_url:
-                                                    for nested_key in ["clip", "audio", "result", "data"]:
-                                                        nested = task_data.get(nested_key, {})
-                                                        if isinstance(nested, dict):
-                                                            if not image_url:
-                                                                image_url = nested.get("image_url") or nested.get("cover_url") or nested.get("thumbnail_url")
-                                                            if not lyrics:
-                                                                lyrics = nested.get("prompt") or nested.get("lyrics") or nested.get("text") or nested.get("content")
-                                                            if not title:
-                                                                title = nested.get("title") or nested.get("name") or nested.get("display_name")
-                                                            if not author:
-                                                                author = nested.get("handle") or nested.get("display_name") or nested.get("author")
-                                                            if not clip_id:
-                                                                clip_id = nested.get("id") or nested.get("clip_id") or nested.get("clipId")
-                                                            if not song_url:
-                                                                for field in potential_url_fields:
-                                                                    if nested.get(field):
-                                                                        song_url = nested.get(field)
-                                                                        logger.info(f"从嵌套结构{nested_key}获取到URL: {song_url}")
-                                                                        break
-                                                            if image_url and lyrics and title and author and clip_id and song_url:
-                                                                break
-                                    
-                                    # 清理URL中的空格和反引号（处理用户提供的响应格式）
-                                    if song_url:
-                                        song_url = song_url.strip()
-                                        if song_url.startswith('`') and song_url.endswith('`'):
-                                            song_url = song_url[1:-1]
-                                        logger.info(f"清理后的song_url: {song_url}")
-                                    if image_url:
-                                        image_url = image_url.strip()
-                                        if image_url.startswith('`') and image_url.endswith('`'):
-                                            image_url = image_url[1:-1]
-                                        logger.info(f"清理后的image_url: {image_url}")
-                                    
-                                    # 记录提取的资源信息
-                                    logger.info(f"提取到的资源信息：song_url={song_url}, image_url={image_url}, lyrics={lyrics[:100]}..." if lyrics else f"提取到的资源信息：song_url={song_url}, image_url={image_url}, lyrics=None")
-                                    
-                                    return {
-                                        "success": True,
-                                        "data": {
-                                            "status": mapped_status,
-                                            "progress": 100 if mapped_status == "SUCCESS" else 50,
-                                            "song_url": song_url,
-                                            "image_url": image_url,
-                                            "lyrics": lyrics,
-                                            "title": title or (task_data.get("title") if isinstance(task_data, dict) else None),
-                                            "author": author,
-                                            "clip": clip,
-                                            "clip_id": clip_id,
-                                            "raw_data": task_data
-                                        }
-                                    }
-                                else:
-                                    logger.error(f"获取任务状态失败: {data.get('message')}")
-                                    return {"success": False, "error": data.get('message')}
-                            else:
-                                logger.error(f"获取任务状态失败: 无效的响应格式")
-                                return {"success": False, "error": "INVALID_RESPONSE_FORMAT"}
-                        except json.JSONDecodeError as e:
-                            logger.error(f"解析JSON响应失败: {str(e)}")
-                            logger.error(f"响应内容: {response_text}")
-                            return {"success": False, "error": "JSON_DECODE_ERROR"}
-                    else:
-                        logger.error(f"获取任务状态请求失败，状态码: {response.status}")
-                        return {"success": False, "error": f"HTTP_{response.status}"}
+            logger.info("发送Suno API请求: %s", url)
+            response = await self._request_with_retry("GET", url, "fetch", deadline=deadline)
+            await self._log_response(url, response)
+            
+            if not response.ok:
+                logger.error("获取任务状态请求失败，状态码: %s", response.status)
+                # 限流和服务端错误可恢复，其余4xx（如认证失败、任务不存在）重试无意义
+                retryable = response.status in _RETRY_STATUSES or response.status >= 500
+                return {"success": False, "error": f"HTTP_{response.status}", "retryable": retryable, "code": response.status}
+            
+            # 检查响应内容类型
+            content_type = response.headers.get("Content-Type", "")
+            if "text/html" in content_type:
+                # 处理HTML响应，这通常是API网关错误或重定向
+                logger.error("获取任务状态失败: API返回了HTML页面而不是JSON响应")
+                logger.error("请检查API地址是否正确，或尝试使用不同的API基础地址")
+                return {"success": False, "error": "HTML_RESPONSE", "retryable": False, "code": response.status}
+            
+            try:
+                data = _loads(await response.read())
+            except json.JSONDecodeError as e:
+                logger.error("解析JSON响应失败: %s", e)
+                logger.error("响应内容: %s", await response.text())
+                return {"success": False, "error": "JSON_DECODE_ERROR", "retryable": True, "code": response.status}
+            if not isinstance(data, dict):
+                logger.error("获取任务状态失败: 无效的响应格式")
+                return {"success": False, "error": "INVALID_RESPONSE_FORMAT", "retryable": True, "code": response.status}
+            if data.get("code") != "success":
+                logger.error("获取任务状态失败: %s", data.get('message'))
+                return {"success": False, "error": data.get('message'), "retryable": True, "code": response.status}
+            
+            return self._parse_task_data(data.get("data") or {}, attempt)
         except Exception as e:
-            logger.error(f"获取任务状态异常: {str(e)}")
-            return {"success": False, "error": str(e)}
+            # 超时、网络异常和熔断都是暂时的
+            logger.error("获取任务状态异常: %s", e)
+            return {"success": False, "error": str(e), "retryable": True, "code": None}
+    
+    def _parse_task_data(self, task_data: Any, attempt: int = 0) -> Dict[str, Any]:
+        """把接口返回的单个任务数据转换为get_task_status的返回格式
+        
+        Args:
+            task_data: 响应中的任务数据，可能是字典、列表或字符串
+            attempt: 调用方已轮询的次数（含本次查询），用于计算返回的retry_after
+        """
+        # 处理两种可能的响应格式
+        clip_id = None
+        clip = {}
+        resources: Dict[str, Any] = {}
+        
+        # 情况1：task_data是字符串（直接是clip_id），尝试解析为JSON
+        if isinstance(task_data, str):
+            clip_id = task_data
+            try:
+                task_data_json = _loads(task_data)
+                if isinstance(task_data_json, dict):
+                    task_data = task_data_json
+                elif isinstance(task_data_json, list) and task_data_json:
+                    task_data = task_data_json[0]
+            except (json.JSONDecodeError, TypeError):
+                pass
+        
+        # 状态在字符串解析为JSON之后读取，字符串形式的响应也能识别完成状态
+        status = task_data.get("status", "PROCESSING") if isinstance(task_data, dict) else "PROCESSING"
+        mapped_status = _STATUS_MAP.get(status, "PROCESSING")
+        
+        # 情况2：task_data是字典，按_NEST_PATHS顺序遍历各层结构，每个字段取第一个非空值
+        if isinstance(task_data, dict):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("task_data结构: %s", _dumps(task_data))
+            clip_id = None
+            for node in _walk(task_data, _NEST_PATHS):
+                if _extract(node, resources):
+                    break
+            
+        song_url = resources.get("song_url")
+        image_url = resources.get("image_url")
+        lyrics = resources.get("lyrics")
+        title = resources.get("title")
+        author = resources.get("author")
+        clip_id = resources.get("clip_id") or clip_id
+        
+        # 如果还是没有找到URL，尝试从原始字符串中提取
+        if not song_url and isinstance(task_data, str):
+            match = _URL_RE.search(task_data)
+            if match:
+                song_url = match.group(1)
+                logger.info("从字符串中提取到URL: %s", song_url)
+            
+        # 清理URL中的空格和反引号（处理用户提供的响应格式）
+        song_url = _clean_url(song_url)
+        image_url = _clean_url(image_url)
+        
+        # 记录提取的资源信息
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("提取到的资源信息：song_url=%s, image_url=%s, lyrics=%s", song_url, image_url, f"{lyrics[:100]}..." if lyrics else None)
+            
+        return {
+            "success": True,
+            "data": {
+                "status": mapped_status,
+                "progress": 100 if mapped_status == "SUCCESS" else 50,
+                "retry_after": 0 if mapped_status in _TERMINAL_STATUSES else _next_poll_delay(attempt),
+                "song_url": song_url,
+                "image_url": image_url,
+                "lyrics": lyrics,
+                "title": title,
+                "author": author,
+                "clip": clip,
+                "clip_id": clip_id,
+                "raw_data": task_data
+            }
+        }
+    
+    async def get_task_status_many(self, task_ids: List[str], attempt: int = 0) -> List[Dict[str, Any]]:
+        """并发查询多个任务状态
+        
+        Args:
+            task_ids: 任务ID列表
+            attempt: 调用方已轮询的次数（含本次查询），用于计算返回的retry_after
+            
+        Returns:
+            List[Dict]: 与task_ids顺序一致的任务状态列表
+        """
+        results = await asyncio.gather(*(self.get_task_status(t, attempt=attempt) for t in task_ids), return_exceptions=True)
+        return [
+            {"success": False, "error": str(r), "retryable": True, "code": None} if isinstance(r, BaseException) else r
+            for r in results
+        ]
+    
+    async def get_task_status_batch(self, task_ids: List[str], attempt: int = 0) -> List[Dict[str, Any]]:
+        """批量查询多个任务状态
+        
+        优先通过 POST /suno/fetch 一次请求查询全部任务，API不支持时回退到并发单独查询，
+        探测结果会被记住，之后不再重复尝试批量接口；批量接口暂时失败时，
+        _BATCH_FETCH_COOLDOWN秒内直接单独查询。
+        
+        Args:
+            task_ids: 任务ID列表
+            attempt: 调用方已轮询的次数（含本次查询），用于计算返回的retry_after
+            
+        Returns:
+            List[Dict]: 与task_ids顺序一致的任务状态列表
+        """
+        if not task_ids:
+            return []
+        if self._supports_batch_fetch is not False and time.monotonic() >= self._batch_retry_at:
+            results = await self._fetch_task_status_batch(task_ids, attempt)
+            if results is not None:
+                return results
+        return await self.get_task_status_many(task_ids, attempt)
+    
+    async def _fetch_task_status_batch(self, task_ids: List[str], attempt: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """get_task_status_batch的批量请求实现，批量接口不可用时返回None"""
+        url = f"{self.api_base}/suno/fetch"
+        payload = {"ids": task_ids}
+        try:
+            logger.info("发送Suno API批量查询请求: %s (%s个任务)", url, len(task_ids))
+            # 批量接口可能不存在：探测请求不重试，并使用独立的熔断器，失败不影响单个任务查询的fetch熔断器
+            response = await self._request_with_retry("POST", url, "fetch_batch", retry=False, data=_encode(payload))
+        except Exception as e:
+            logger.warning("批量查询任务状态异常，%s秒内改为单独查询: %s", _BATCH_FETCH_COOLDOWN, e)
+            self._batch_retry_at = time.monotonic() + _BATCH_FETCH_COOLDOWN
+            return None
+        
+        if response.status in (404, 405) or "text/html" in response.headers.get("Content-Type", ""):
+            logger.info("API不支持批量查询任务状态(状态码: %s)，之后改为并发单独查询", response.status)
+            self._supports_batch_fetch = False
+            return None
+        if not response.ok:
+            logger.warning("批量查询任务状态失败，状态码: %s，%s秒内改为单独查询", response.status, _BATCH_FETCH_COOLDOWN)
+            self._batch_retry_at = time.monotonic() + _BATCH_FETCH_COOLDOWN
+            return None
+        
+        try:
+            data = _loads(await response.read())
+        except json.JSONDecodeError as e:
+            logger.warning("解析批量查询响应失败，%s秒内改为单独查询: %s", _BATCH_FETCH_COOLDOWN, e)
+            self._batch_retry_at = time.monotonic() + _BATCH_FETCH_COOLDOWN
+            return None
+        if not isinstance(data, dict) or data.get("code") != "success" or not isinstance(data.get("data"), list):
+            logger.info("批量查询接口响应格式无法识别，之后改为并发单独查询")
+            self._supports_batch_fetch = False
+            return None
+        
+        # 按task_id匹配结果；结果没有id字段时无法确定对应关系（可能缺少或打乱了任务），视为不支持
+        by_id = {
+            item.get("task_id") or item.get("id"): item
+            for item in data["data"] if isinstance(item, dict)
+        }
+        by_id.pop(None, None)
+        if not by_id:
+            logger.info("批量查询结果缺少任务ID，无法与任务对应，之后改为并发单独查询")
+            self._supports_batch_fetch = False
+            return None
+        self._supports_batch_fetch = True
+        results = []
+        for task_id in task_ids:
+            task_data = by_id.get(task_id)
+            if task_data is None:
+                results.append({"success": False, "error": "TASK_NOT_FOUND", "retryable": True, "code": response.status})
+                continue
+            try:
+                results.append(self._parse_task_data(task_data, attempt))
+            except Exception as e:
+                logger.error("解析任务 %s 状态异常: %s", task_id, e)
+                results.append({"success": False, "error": str(e), "retryable": True, "code": response.status})
+        return results
     
     async def get_wav(self, clip_id: str) -> Optional[Dict[str, Any]]:
         """获取wav文件 - 使用Vector Engine API
@@ -460,70 +901,113 @@ class SunoAIClient:
         url = f"{self.api_base}/suno/act/wav/{clip_id}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                
-                # 发送请求，使用已配置的headers（包含Authorization信息）
-                async with session.get(url, headers=self.headers) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
+            logger.info("发送Suno API请求: %s", url)
+            
+            # 发送请求，会话默认headers已包含Authorization信息
+            response = await self._request_with_retry("GET", url, "wav")
+            
+            # 该接口应返回JSON元数据，二进制音频不做文本解码
+            content_type = response.headers.get("Content-Type", "")
+            if content_type.startswith("audio/") or content_type.startswith("application/octet-stream"):
+                logger.error("获取wav失败: 接口直接返回了音频数据(%s)，请改用音频地址直接下载", content_type)
+                return {
+                    "success": False,
+                    "error": "接口返回了音频数据而不是JSON"
+                }
+            
+            await self._log_response(url, response)
+            
+            if response.status == 200:
+                try:
+                    # 解析JSON响应
+                    data = _loads(await response.read())
                     
-                    if response.status == 200:
-                        try:
-                            # 解析JSON响应
-                            data = await response.json()
-                            
-                            if isinstance(data, dict):
-                                code = data.get("code")
-                                response_data = data.get("data")
-                                message = data.get("message", "")
-                                
-                                if code == "success":
-                                    # 成功响应
-                                    return {
-                                        "success": True,
-                                        "data": response_data,
-                                        "message": message
-                                    }
-                                else:
-                                    # 错误响应
-                                    logger.error(f"获取wav失败: {message}")
-                                    return {
-                                        "success": False,
-                                        "error": message,
-                                        "code": code
-                                    }
-                            else:
-                                # 无效的响应格式
-                                logger.error(f"获取wav失败: 无效的响应格式")
-                                return {
-                                    "success": False,
-                                    "error": "无效的响应格式"
-                                }
-                        except json.JSONDecodeError as e:
-                            # JSON解析失败
-                            logger.error(f"解析wav响应失败: {str(e)}")
-                            logger.error(f"响应内容: {response_text}")
+                    if isinstance(data, dict):
+                        code = data.get("code")
+                        response_data = data.get("data")
+                        message = data.get("message", "")
+                        
+                        if code == "success":
+                            # 成功响应
+                            return {
+                                "success": True,
+                                "data": response_data,
+                                "message": message
+                            }
+                        else:
+                            # 错误响应
+                            logger.error("获取wav失败: %s", message)
                             return {
                                 "success": False,
-                                "error": f"JSON解析失败: {str(e)}"
+                                "error": message,
+                                "code": code
                             }
                     else:
-                        # HTTP请求失败
-                        logger.error(f"获取wav请求失败，状态码: {response.status}")
+                        # 无效的响应格式
+                        logger.error("获取wav失败: 无效的响应格式")
                         return {
                             "success": False,
-                            "error": f"HTTP请求失败，状态码: {response.status}"
+                            "error": "无效的响应格式"
                         }
+                except json.JSONDecodeError as e:
+                    # JSON解析失败
+                    logger.error("解析wav响应失败: %s", e)
+                    logger.error("响应内容: %s", await response.text())
+                    return {
+                        "success": False,
+                        "error": f"JSON解析失败: {str(e)}"
+                    }
+            else:
+                # HTTP请求失败
+                logger.error("获取wav请求失败，状态码: %s", response.status)
+                return {
+                    "success": False,
+                    "error": f"HTTP请求失败，状态码: {response.status}"
+                }
         except Exception as e:
             # 其他异常
-            logger.error(f"获取wav异常: {str(e)}")
+            logger.error("获取wav异常: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    async def download_to_file(self, url: str, path: str) -> bool:
+        """将文件分块流式写入磁盘，不在内存中缓冲完整内容
+        
+        Args:
+            url: 文件地址
+            path: 保存路径
+            
+        Returns:
+            bool: 是否下载成功，失败时删除不完整的文件
+        """
+        try:
+            session = await self._get_download_session()
+            async with session.get(url, timeout=_DOWNLOAD_TIMEOUT) as response:
+                if response.status != 200:
+                    logger.error("下载文件失败，状态码: %s", response.status)
+                    await asyncio.to_thread(_remove_file, path)
+                    return False
+                # 文件的打开、写入和关闭都放到线程中执行；小块先在内存中攒够再写，减少线程切换次数
+                f = await asyncio.to_thread(open, path, "wb")
+                try:
+                    buf = bytearray()
+                    async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                        buf += chunk
+                        if len(buf) >= _DOWNLOAD_WRITE_SIZE:
+                            await asyncio.to_thread(f.write, bytes(buf))
+                            buf.clear()
+                    if buf:
+                        await asyncio.to_thread(f.write, bytes(buf))
+                finally:
+                    await asyncio.to_thread(f.close)
+            return True
+        except Exception as e:
+            logger.error("下载文件异常: %s", e)
+            await asyncio.to_thread(_remove_file, path)
+            return False
+    
     async def generate_lyrics(self, prompt: str, notify_hook: str = "") -> Optional[str]:
         """生成歌词 - 使用Vector Engine API
         
@@ -549,48 +1033,24 @@ class SunoAIClient:
         # 添加可选参数
         if notify_hook:
             payload["notify_hook"] = notify_hook
-            logger.info(f"设置回调通知地址: {notify_hook}")
+            logger.info("设置回调通知地址: %s", notify_hook)
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                logger.info(f"请求参数: {payload}")
-                async with session.post(url, headers=self.headers, json=payload) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, dict):
-                            if data.get("code") == "success":
-                                # 返回task_id
-                                return data["data"]
-                            else:
-                                logger.error(f"生成歌词失败: {data.get('message')}")
-                        else:
-                            logger.error(f"生成歌词失败: 无效的响应格式")
-                    else:
-                        logger.error(f"生成歌词请求失败，状态码: {response.status}")
-        except Exception as e:
-            logger.error(f"生成歌词异常: {str(e)}")
-        return None
+        result = await self._call("POST", url, "lyrics", "生成歌词", payload)
+        # 成功时data为task_id
+        return result["data"] if result["success"] else None
     
     async def download_song(self, song_url: str) -> Optional[bytes]:
         """下载歌曲"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(song_url, headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                    "Cookie": self.cookie
-                }) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        logger.error(f"下载歌曲失败，状态码: {response.status}")
-                        logger.error(f"响应内容: {await response.text()}")
+            session = await self._get_download_session()
+            async with session.get(song_url, timeout=_DOWNLOAD_TIMEOUT) as response:
+                if response.status == 200:
+                    return await response.read()
+                else:
+                    logger.error("下载歌曲失败，状态码: %s", response.status)
+                    logger.error("响应内容: %s", await response.text())
         except Exception as e:
-            logger.error(f"下载歌曲异常: {str(e)}")
+            logger.error("下载歌曲异常: %s", e)
         return None
     
     async def get_balance(self) -> Optional[Dict[str, Any]]:
@@ -614,28 +1074,8 @@ class SunoAIClient:
         """
         url = f"{self.api_base}/suno/uploads/audio"
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                async with session.post(url, headers=self.headers) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, dict):
-                            if data.get("code") == "success":
-                                return data["data"]
-                            else:
-                                logger.error(f"请求上传授权失败: {data.get('message')}")
-                        else:
-                            logger.error(f"请求上传授权失败: 无效的响应格式")
-                    else:
-                        logger.error(f"请求上传授权失败，状态码: {response.status}")
-        except Exception as e:
-            logger.error(f"请求上传授权异常: {str(e)}")
-        return None
+        result = await self._call("POST", url, "upload", "请求上传授权")
+        return result["data"] if result["success"] else None
     
     async def report_upload_finish(self, upload_id: str, upload_type: str = "file_upload", upload_filename: str = "audio.mp3") -> bool:
         """报告上传完毕 - 第3步
@@ -655,21 +1095,9 @@ class SunoAIClient:
             "upload_filename": upload_filename
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                async with session.post(url, headers=self.headers, json=payload) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        return True
-                    else:
-                        logger.error(f"报告上传完毕失败，状态码: {response.status}")
-        except Exception as e:
-            logger.error(f"报告上传完毕异常: {str(e)}")
-        return False
+        result = await self._call("POST", url, "upload", "报告上传完毕", payload)
+        # 该接口只以HTTP状态码判断是否成功
+        return result["code"] == 200
     
     async def get_upload_status(self, upload_id: str) -> Optional[Dict[str, Any]]:
         """查询上传状态 - 第4步
@@ -682,28 +1110,8 @@ class SunoAIClient:
         """
         url = f"{self.api_base}/suno/uploads/audio/{upload_id}"
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                async with session.get(url, headers=self.headers) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, dict):
-                            if data.get("code") == "success":
-                                return data["data"]
-                            else:
-                                logger.error(f"查询上传状态失败: {data.get('message')}")
-                        else:
-                            logger.error(f"查询上传状态失败: 无效的响应格式")
-                    else:
-                        logger.error(f"查询上传状态失败，状态码: {response.status}")
-        except Exception as e:
-            logger.error(f"查询上传状态异常: {str(e)}")
-        return None
+        result = await self._call("GET", url, "upload", "查询上传状态")
+        return result["data"] if result["success"] else None
     
     async def initialize_clip(self, upload_id: str) -> Optional[Dict[str, Any]]:
         """初始化音频clip - 第5步
@@ -716,31 +1124,359 @@ class SunoAIClient:
         """
         url = f"{self.api_base}/suno/uploads/audio/{upload_id}/initialize-clip"
         
+        result = await self._call("POST", url, "upload", "初始化音频clip")
+        return result["data"] if result["success"] else None
+
+
+class SunoNotifyHub:
+    """notify_hook回调接收器 - 收到回调时唤醒等待对应task_id的协程"""
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._runner: Optional["web.AppRunner"] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+    
+    def register(self, task_id: str) -> asyncio.Future:
+        """注册等待回调的任务，返回回调到达时完成的Future"""
+        fut = self._pending.get(task_id)
+        if fut is None or fut.done():
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[task_id] = fut
+        return fut
+    
+    def discard(self, task_id: str):
+        """取消等待"""
+        fut = self._pending.pop(task_id, None)
+        if fut is not None and not fut.done():
+            fut.cancel()
+    
+    async def handle_notify(self, request: "web.Request") -> "web.Response":
+        """处理notify_hook回调请求"""
+        from aiohttp import web
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"发送Suno API请求: {url}")
-                async with session.post(url, headers=self.headers) as response:
-                    logger.info(f"API响应状态码: {response.status}")
-                    response_text = await response.text()
-                    logger.info(f"API响应内容: {response_text}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        if isinstance(data, dict):
-                            if data.get("code") == "success":
-                                return data["data"]
-                            else:
-                                logger.error(f"初始化音频clip失败: {data.get('message')}")
-                        else:
-                            logger.error(f"初始化音频clip失败: 无效的响应格式")
-                    else:
-                        logger.error(f"初始化音频clip失败，状态码: {response.status}")
+            payload = await request.json()
+        except (json.JSONDecodeError, aiohttp.ContentTypeError):
+            return web.json_response({"code": "error", "message": "invalid json"}, status=400)
+        
+        data = payload.get("data", payload) if isinstance(payload, dict) else None
+        task_id = (data.get("task_id") or data.get("id")) if isinstance(data, dict) else None
+        logger.info("收到notify_hook回调，任务ID: %s", task_id)
+        
+        fut = self._pending.pop(task_id, None) if task_id else None
+        if fut is not None and not fut.done():
+            fut.set_result(data)
+        return web.json_response({"code": "success"})
+    
+    async def start(self, host: str, port: int, path: str = "/suno/notify"):
+        """启动回调监听服务"""
+        if self._runner is not None:
+            return
+        # 服务端模块只在启用回调服务时才导入
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_post(path, self.handle_notify)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        self._runner = runner
+        logger.info("notify_hook回调服务已启动: %s:%s%s", host, port, path)
+    
+    async def stop(self):
+        """停止回调监听服务并取消所有等待"""
+        for task_id in list(self._pending):
+            self.discard(task_id)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# 全局回调接收器，由插件启用/禁用时启动/停止
+notify_hub = SunoNotifyHub()
+
+
+class SunoConnectionPool:
+    """插件级共享连接池 - 缓存各账户的客户端，跨命令复用会话、TCP/TLS连接和DNS缓存"""
+    def __init__(self):
+        self.connector: Optional[aiohttp.TCPConnector] = None
+        # 账户Cookie -> 客户端；所有客户端使用同一组API配置_settings，配置变化时全部替换
+        self._clients: Dict[str, SunoAIClient] = {}
+        self._settings: Optional[Tuple[str, str, int, bool]] = None
+        # 客户端 -> 正在使用它的命令数，由lease()维护
+        self._leases: Dict[SunoAIClient, int] = {}
+        # 已从缓存移除但仍有命令在使用的旧客户端，最后一个使用者结束后关闭
+        self._retired: set = set()
+        # 正在关闭的旧客户端，保留引用直到关闭完成
+        self._closing: set = set()
+        # 限制所有命令同时进行的任务状态查询数量，多人同时轮询时避免触发API限流
+        self.status_sem = asyncio.Semaphore(8)
+    
+    @contextlib.asynccontextmanager
+    async def lease(self, cookie: str, api_base: str, api_key: str, max_inflight: int = 8, use_http2: bool = False):
+        """在async with期间使用指定账户和API配置的客户端；客户端由连接池关闭，调用方不应关闭
+        
+        使用期间客户端即使因配置变化被替换也不会关闭，最后一个使用者结束后才关闭。
+        """
+        client = self._get_client(cookie, api_base, api_key, max_inflight, use_http2)
+        self._leases[client] = self._leases.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            remaining = self._leases.pop(client) - 1
+            if remaining:
+                self._leases[client] = remaining
+            elif client in self._retired:
+                self._retired.discard(client)
+                self._close_later(client)
+    
+    def _get_client(self, cookie: str, api_base: str, api_key: str, max_inflight: int = 8, use_http2: bool = False) -> SunoAIClient:
+        """获取指定账户和API配置的客户端，不存在时创建
+        
+        API配置（地址、密钥、并发数、HTTP/2）与缓存的客户端不同时，旧客户端全部从缓存移除。
+        """
+        settings = (api_base, api_key, max_inflight, use_http2)
+        if settings != self._settings:
+            if self._clients:
+                logger.info("API配置已变化，替换%s个旧客户端", len(self._clients))
+            self._retire(list(self._clients))
+            self._settings = settings
+        client = self._clients.get(cookie)
+        if client is None:
+            client = self._clients[cookie] = SunoAIClient(cookie, api_base, api_key, max_inflight, use_http2, self.connector)
+        return client
+    
+    def retain(self, cookies: Sequence[str]):
+        """移除不在当前账户配置中的客户端（如Cookie已更换或账户已删除）"""
+        keep = set(cookies)
+        self._retire([cookie for cookie in self._clients if cookie not in keep])
+    
+    def _retire(self, cookies: List[str]):
+        """从缓存中移除客户端；没有命令在使用时在后台关闭，否则等最后一个使用者结束后关闭"""
+        for cookie in cookies:
+            client = self._clients.pop(cookie)
+            if client in self._leases:
+                self._retired.add(client)
+            else:
+                self._close_later(client)
+    
+    def _close_later(self, client: SunoAIClient):
+        """在后台关闭客户端的会话"""
+        task = asyncio.ensure_future(client.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    def start(self, limit_per_host: int = 8):
+        """创建连接池，需在事件循环中调用"""
+        self.status_sem = asyncio.Semaphore(max(1, int(limit_per_host)))
+        if self.connector is None or self.connector.closed:
+            self.connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=max(1, int(limit_per_host)),
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            )
+    
+    async def stop(self):
+        """关闭所有缓存的客户端和连接池"""
+        clients = list(self._clients.values()) + list(self._retired)
+        self._clients.clear()
+        self._retired.clear()
+        self._settings = None
+        for client in clients:
+            await client.close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self.connector is not None:
+            await self.connector.close()
+            self.connector = None
+
+
+# 全局连接池，由插件启用/禁用时创建/关闭；未启用时缓存的客户端各自创建连接池
+connection_pool = SunoConnectionPool()
+
+
+class SunoStatusWatcher:
+    """共享任务状态轮询器 - 所有命令等待的任务由同一个后台任务按客户端批量查询
+    
+    有任务在等待时才运行后台任务，没有等待者时自动退出。
+    """
+    def __init__(self):
+        # 客户端 -> task_id -> 等待下一次查询结果的Future列表
+        self._waiters: Dict[SunoAIClient, Dict[str, List[asyncio.Future]]] = {}
+        # 上一次查询到的(状态, 进度)，用于判断是否有变化
+        self._last: Dict[Tuple[SunoAIClient, str], Tuple[Any, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.delay = _WATCH_INITIAL_DELAY
+    
+    def watch(self, client: SunoAIClient, task_id: str) -> asyncio.Future:
+        """等待任务的下一次查询结果
+        
+        Args:
+            client: 查询使用的客户端
+            task_id: 任务ID
+            
+        Returns:
+            asyncio.Future: 下一轮查询完成时以get_task_status格式的结果完成
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(client, {}).setdefault(task_id, []).append(fut)
+        if (client, task_id) not in self._last:
+            # 新任务加入时尽快查询一次
+            self.delay = _WATCH_INITIAL_DELAY
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return fut
+    
+    async def _run(self):
+        """后台轮询：每轮把所有等待中的任务按客户端合并为一次批量查询"""
+        while self._waiters:
+            await asyncio.sleep(self.delay)
+            waiters, self._waiters = self._waiters, {}
+            try:
+                changed = await asyncio.gather(*(
+                    self._poll(client, by_task) for client, by_task in waiters.items()
+                ))
+            except asyncio.CancelledError:
+                # 停止时取消本轮正在查询的等待者
+                for by_task in waiters.values():
+                    for futs in by_task.values():
+                        for fut in futs:
+                            fut.cancel()
+                raise
+            # 只保留本轮仍在等待的任务的记录
+            polled = {(client, task_id) for client, by_task in waiters.items() for task_id in by_task}
+            for key in self._last.keys() - polled:
+                del self._last[key]
+            self.delay = _WATCH_INITIAL_DELAY if any(changed) else min(self.delay * 2, _WATCH_MAX_DELAY)
+        # 没有等待者时退出，之后再加入的任务都视为新任务
+        self._last.clear()
+    
+    async def _poll(self, client: SunoAIClient, by_task: Dict[str, List[asyncio.Future]]) -> bool:
+        """批量查询同一客户端的任务并唤醒等待者，返回是否有任务状态或进度变化"""
+        task_ids = [task_id for task_id, futs in by_task.items() if any(not f.done() for f in futs)]
+        if not task_ids:
+            return False
+        try:
+            async with connection_pool.status_sem:
+                results = await client.get_task_status_batch(task_ids)
         except Exception as e:
-            logger.error(f"初始化音频clip异常: {str(e)}")
-        return None
+            logger.error("共享轮询查询任务状态异常: %s", e)
+            results = [{"success": False, "error": str(e), "retryable": True, "code": None}] * len(task_ids)
+        
+        changed = False
+        for task_id, result in zip(task_ids, results):
+            data = (result.get("data") or _EMPTY_DATA) if result.get("success") else _EMPTY_DATA
+            state = (data.get("status"), data.get("progress"))
+            if self._last.get((client, task_id)) != state:
+                self._last[(client, task_id)] = state
+                changed = True
+            for fut in by_task[task_id]:
+                if not fut.done():
+                    fut.set_result(result)
+        return changed
+    
+    async def stop(self):
+        """停止后台轮询并取消所有等待"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for by_task in self._waiters.values():
+            for futs in by_task.values():
+                for fut in futs:
+                    fut.cancel()
+        self._waiters.clear()
+        self._last.clear()
+        self.delay = _WATCH_INITIAL_DELAY
+
+
+# 全局共享轮询器，歌词命令通过它等待任务状态，多个命令同时等待时共用一次批量查询
+status_watcher = SunoStatusWatcher()
+
+
+@functools.lru_cache(maxsize=None)
+def _audio_send_method(command_cls: type) -> Optional[str]:
+    """返回命令类可用的音频发送方法名，优先send_file，其次send_voice，按类缓存"""
+    for name in ("send_file", "send_voice"):
+        if callable(getattr(command_cls, name, None)):
+            return name
+    return None
 
 
-class SunoSingCommand(BaseCommand):
+# 账户列表中的一项：账户名:cookie，以竖线分隔；没有冒号时cookie组为None
+_ACCOUNT_RE = re.compile(r"\s*([^|:]*?)\s*(?::\s*([^|]*?))?\s*(?:\||$)")
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_accounts(raw: str) -> Tuple[Tuple[str, str], ...]:
+    """解析账户列表配置，结果按原始字符串缓存"""
+    cleaned = raw.strip()
+    
+    # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
+    if "|" not in cleaned and ":" not in cleaned:
+        logger.info("检测到直接输入的Cookie，使用默认账户名")
+        return (("default", cleaned),)
+    
+    # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
+    accounts = []
+    for match in _ACCOUNT_RE.finditer(cleaned):
+        account_name, cookie = match.groups()
+        if cookie is not None:
+            accounts.append((account_name, cookie))
+        elif account_name:
+            # 没有冒号时假设是直接输入的Cookie
+            accounts.append(("default", account_name))
+            logger.info("检测到直接输入的Cookie，使用默认账户名")
+    return tuple(accounts)
+
+
+def parse_accounts(raw: str) -> Dict[str, str]:
+    """解析账户列表配置
+    
+    Args:
+        raw: 账户列表，格式：账户名1:cookie1|账户名2:cookie2，也可以直接填写单个Cookie
+        
+    Returns:
+        Dict[str, str]: 账户名到Cookie的映射，同名账户以后出现的为准
+    """
+    return dict(_parse_accounts(raw))
+
+
+# API返回HTML页面时提示用户检查API地址
+_HTML_RESPONSE_HINT = (
+    "⚠️ API返回了HTML页面，请检查API地址是否正确",
+    "📌 建议尝试不同的API基础地址：",
+    "   1. https://api.vectorengine.ai",
+    "   2. https://api.vectorengine.ai/v1",
+    "   3. https://api.vectorengine.ai/v1/chat/completions",
+)
+
+
+class _BatchSendMixin:
+    """为命令提供把多行消息合并为一次发送的方法"""
+    
+    async def send_text_batch(self, lines: Sequence[str]):
+        """将多行消息用换行合并为一条发送，忽略空行"""
+        text = "\n".join(line for line in lines if line)
+        if text:
+            await self.send_text(text)
+
+
+class _ConfigMixin:
+    """按点分键读取配置，缺省值统一取自SunoAIPlugin.config_schema"""
+    
+    def _cfg(self, key: str) -> Any:
+        """读取配置项，未配置时返回config_schema中声明的默认值"""
+        return self.get_config(key, _CONFIG_DEFAULTS[key])
+
+
+class SunoSingCommand(_ConfigMixin, _BatchSendMixin, BaseCommand):
     """Suno AI唱歌命令"""
     command_name: str = "suno_sing"
     command_description: str = "使用Suno AI生成AI歌曲"
@@ -758,37 +1494,18 @@ class SunoSingCommand(BaseCommand):
             return True, "缺少歌曲描述", 1
         
         # 获取配置
-        api_base = self.get_config("api.api_base", "https://api.vectorengine.ai")
-        api_key = self.get_config("api.api_key", "")
-        model = self.get_config("api.model", "suno_music")
-        default_account = self.get_config("accounts.default_account", "default")
-        accounts_list = self.get_config("accounts.accounts_list", "default:")
+        api_base = self._cfg("api.api_base")
+        api_key = self._cfg("api.api_key")
+        model = self._cfg("api.model")
+        max_inflight = self._cfg("api.max_inflight")
+        use_http2 = self._cfg("api.use_http2")
+        notify_hook = self._cfg("notify.public_url") if notify_hub.running else ""
+        default_account = self._cfg("accounts.default_account")
+        accounts_list = self._cfg("accounts.accounts_list")
         
         # 解析账户列表
-        accounts = {}
-        # 处理配置格式
-        cleaned_accounts_list = accounts_list.strip()
-        
-        # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
-        if "|" not in cleaned_accounts_list and ":" not in cleaned_accounts_list:
-            # 直接将整个内容作为默认账户的Cookie
-            accounts["default"] = cleaned_accounts_list
-            logger.info("检测到直接输入的Cookie，使用默认账户名")
-        else:
-            # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
-            for account_entry in cleaned_accounts_list.split("|"):
-                if account_entry.strip():
-                    parts = account_entry.split(":", 1)
-                    if len(parts) == 2:
-                        account_name, cookie = parts
-                        accounts[account_name.strip()] = cookie.strip()
-                    elif len(parts) == 1 and parts[0].strip():
-                        # 如果只有一个部分且不为空，假设是直接输入的Cookie
-                        accounts["default"] = parts[0].strip()
-                        logger.info("检测到直接输入的Cookie，使用默认账户名")
-                    else:
-                        # 跳过空的配置项
-                        logger.warning(f"跳过无效的账户配置: {account_entry}")
+        accounts = parse_accounts(accounts_list)
+        connection_pool.retain(list(accounts.values()))
         
         # 选择账户
         selected_account = default_account
@@ -796,344 +1513,319 @@ class SunoSingCommand(BaseCommand):
         
         # 检查API密钥
         if not api_key:
-            await self.send_text("❌ 生成歌曲失败：未配置API密钥")
-            await self.send_text("请在配置文件中设置有效的Vector Engine API密钥")
-            await self.send_text("配置文件位置：plugins/suno_ai/config.toml")
+            await self.send_text(
+                "❌ 生成歌曲失败：未配置API密钥\n"
+                "请在配置文件中设置有效的Vector Engine API密钥\n"
+                "配置文件位置：plugins/suno_ai/config.toml"
+            )
             return True, "未配置API密钥", 1
         
         # 修复模型名称，确保使用正确的模型
         if model == "suno_music":
-            model = "chirp-v4"  # 默认使用最新模型
-            logger.info("检测到旧模型名称'suno_music'，已自动切换为'chirp-v4'")
-        
-        # 创建Suno AI客户端
-        suno_client = SunoAIClient(selected_cookie, api_base, api_key)
-        
-        # 生成歌曲
-        # 根据prompt判断生成类型
-        music_type = "song"
-        if "随机" in prompt:
-            music_type = "random"
-        elif "纯音乐" in prompt:
-            music_type = "pure_music"
-        
-        task_id = await suno_client.generate_song(prompt, music_type=music_type, model=model)
-        if not task_id:
-            await self.send_text("❌ 生成歌曲失败，请检查配置或稍后重试")
-            await self.send_text("错误详情：请查看日志获取更多信息")
-            return True, "生成歌曲失败", 1
-        
-        # 合并所有状态消息为一条
-        status_message = f"🎵 正在生成歌曲：{prompt}...\n"
-        status_message += f"🔑 使用账户：{selected_account}\n"
-        status_message += f"🌐 使用API：Vector Engine API\n"
-        status_message += f"🔄 歌曲生成中，任务ID：{task_id}，请稍候..."
-        
-        # 发送合并后的状态消息
-        await self.send_text(status_message)
-        
-        max_wait_time = 300  # 最大等待时间5分钟
-        start_time = time.time()
-        song_url = None
-        image_url = None
-        lyrics = None
-        clip_id = None
-        title = None
-        author = None
-        consecutive_errors = 0
-        max_consecutive_errors = 3
-        
-        while time.time() - start_time < max_wait_time:
-            await asyncio.sleep(10)  # 每10秒查询一次
-            
-            task_status = await suno_client.get_task_status(task_id)
-            if task_status.get("success"):
-                consecutive_errors = 0  # 重置错误计数
-                data = task_status.get("data", {})
-                status = data.get("status")
-                
-                if status == "SUCCESS":
-                    song_url = data.get("song_url")
-                    image_url = data.get("image_url")
-                    lyrics = data.get("lyrics")
-                    clip_id = data.get("clip_id")
-                    title = data.get("title")
-                    author = data.get("author")
-                    break
-                elif status == "FAILED":
-                    await self.send_text("歌曲生成失败")
-                    return True, "歌曲生成失败", 1
-                elif status == "PROCESSING":
-                    # 不发送进度消息，只在任务完成时通知用户
-                    pass
-            else:
-                consecutive_errors += 1
-                error = task_status.get("error", "未知错误")
+            model = _DEFAULT_MODEL
+            logger.info("检测到旧模型名称'suno_music'，已自动切换为'%s'", _DEFAULT_MODEL)
+        
+        # 获取Suno AI客户端，按账户缓存并跨命令复用
+        async with connection_pool.lease(selected_cookie, api_base, api_key, max_inflight, use_http2) as suno_client:
+            # 生成歌曲
+            # 根据prompt判断生成类型
+            music_type = "song"
+            if "随机" in prompt:
+                music_type = "random"
+            elif "纯音乐" in prompt:
+                music_type = "pure_music"
                 
-                if error == "HTML_RESPONSE":
-                    await self.send_text("⚠️ API返回了HTML页面，请检查API地址是否正确")
-                    await self.send_text("📌 建议尝试不同的API基础地址：")
-                    await self.send_text("   1. https://api.vectorengine.ai")
-                    await self.send_text("   2. https://api.vectorengine.ai/v1")
-                    await self.send_text("   3. https://api.vectorengine.ai/v1/chat/completions")
-                    return True, "API地址错误", 1
-                elif error == "JSON_DECODE_ERROR":
-                    await self.send_text("⚠️ API返回了无效的JSON格式")
-                else:
-                    await self.send_text(f"⚠️ 获取任务状态失败：{error}")
+            task_id = await suno_client.generate_song(prompt, music_type=music_type, model=model, notify_hook=notify_hook)
+            if not task_id:
+                await self.send_text(
+                    "❌ 生成歌曲失败，请检查配置或稍后重试\n"
+                    "错误详情：请查看日志获取更多信息"
+                )
+                return True, "生成歌曲失败", 1
                 
-                if consecutive_errors >= max_consecutive_errors:
-                    await self.send_text(f"❌ 连续{max_consecutive_errors}次获取任务状态失败，终止轮询")
-                    return True, "获取任务状态失败", 1
+            # 合并所有状态消息为一条
+            status_message = (
+                f"🎵 正在生成歌曲：{prompt}...\n"
+                f"🔑 使用账户：{selected_account}\n"
+                "🌐 使用API：Vector Engine API\n"
+                f"🔄 歌曲生成中，任务ID：{task_id}，请稍候..."
+            )
+            
+            # 发送合并后的状态消息
+            await self.send_text(status_message)
             
-            # 检查是否超时
-            if time.time() - start_time >= max_wait_time:
-                await self.send_text("歌曲生成超时，请稍后重试")
-                return True, "歌曲生成超时", 1
-        
-        # 下载并发送歌曲、图片封面和歌词
-        if song_url:
-            song_data = await suno_client.download_song(song_url)
+            max_wait_time = 300  # 最大等待时间5分钟
+            deadline = time.monotonic() + max_wait_time  # 使用单调时钟，不受系统时间调整影响；状态查询（含重试）也不能超过该截止时间
+            song_url = None
+            image_url = None
+            lyrics = None
+            clip_id = None
+            title = None
+            author = None
+            consecutive_errors = 0
+            max_consecutive_errors = 3
+            # 配置了notify_hook时，回调到达会提前唤醒轮询，轮询仅作为兜底
+            notify_future = notify_hub.register(task_id) if notify_hook else None
+            poll_attempt = 0
+            poll_delay = _next_poll_delay(0)
+            last_raw_status = None
             
-            if song_data:
-                # 保存到临时文件
-                temp_file = f"temp_song_{int(time.time())}.mp3"
-                with open(temp_file, "wb") as f:
-                    f.write(song_data)
+            try:
+                while time.monotonic() < deadline:
+                    wait = poll_delay * (1 + random.uniform(0, _POLL_JITTER))
+                    if notify_future is not None and not notify_future.done():
+                        try:
+                            await asyncio.wait_for(asyncio.shield(notify_future), timeout=wait)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await asyncio.sleep(wait)
+                        
+                    # attempt为已完成的轮询次数（含本次），返回的retry_after即本次之后的等待时间
+                    poll_attempt += 1
+                    async with connection_pool.status_sem:
+                        task_status = await suno_client.get_task_status(task_id, deadline=deadline, attempt=poll_attempt)
+                    if task_status.get("success"):
+                        consecutive_errors = 0  # 重置错误计数
+                        data = task_status.get("data") or _EMPTY_DATA
+                        status = data.get("status")
+                        poll_delay = data.get("retry_after", _next_poll_delay(poll_attempt))
+                        
+                        # 任务排队结束开始生成，重置轮询间隔以尽快发现完成
+                        raw_data = data.get("raw_data")
+                        raw_status = raw_data.get("status") if isinstance(raw_data, dict) else None
+                        if raw_status == "IN_PROGRESS" and last_raw_status in _QUEUED_STATUSES:
+                            poll_attempt = _POLL_FAST_ATTEMPTS
+                            poll_delay = _next_poll_delay(poll_attempt)
+                        last_raw_status = raw_status
+                        
+                        if status == "SUCCESS":
+                            song_url = data.get("song_url")
+                            image_url = data.get("image_url")
+                            lyrics = data.get("lyrics")
+                            clip_id = data.get("clip_id")
+                            title = data.get("title")
+                            author = data.get("author")
+                            break
+                        elif status == "FAILED":
+                            await self.send_text("歌曲生成失败")
+                            return True, "歌曲生成失败", 1
+                        elif status == "PROCESSING":
+                            # 不发送进度消息，只在任务完成时通知用户
+                            pass
+                    else:
+                        poll_delay = _next_poll_delay(poll_attempt)
+                        error = str(task_status.get("error") or "未知错误")
+                        
+                        if task_status.get("code") in _RETRY_STATUSES:
+                            # 限流或服务端临时错误：不计入连续失败次数，按退避间隔继续轮询直到超时
+                            logger.warning("获取任务状态暂时失败(%s)，%.1f秒后重试", error, poll_delay)
+                        elif error == "HTML_RESPONSE":
+                            await self.send_text_batch(_HTML_RESPONSE_HINT)
+                            return True, "API地址错误", 1
+                        elif not task_status.get("retryable", True):
+                            # 不可恢复的错误（如认证失败、任务不存在），继续轮询没有意义
+                            await self.send_text(f"❌ 获取任务状态失败：{error}，终止轮询")
+                            return True, "获取任务状态失败", 1
+                        else:
+                            consecutive_errors += 1
+                            lines = ["⚠️ API返回了无效的JSON格式" if error == "JSON_DECODE_ERROR" else f"⚠️ 获取任务状态失败：{error}"]
+                            if consecutive_errors >= max_consecutive_errors:
+                                lines.append(f"❌ 连续{max_consecutive_errors}次获取任务状态失败，终止轮询")
+                                await self.send_text_batch(lines)
+                                return True, "获取任务状态失败", 1
+                            await self.send_text_batch(lines)
+                else:
+                    # 等待超过截止时间仍未完成
+                    await self.send_text("歌曲生成超时，请稍后重试")
+                    return True, "歌曲生成超时", 1
+            finally:
+                if notify_future is not None:
+                    notify_hub.discard(task_id)
                 
-                try:
-                    # 准备转发消息内容
-                    message_content = []
-                    
-                    # 添加歌曲生成完成消息
-                    message_content.append("🎵 歌曲生成完成！\n")
-                    
-                    # 添加作者信息（如果有）
-                    if author:
-                        message_content.append(f"👤 作者：{author}\n")
-                    
-                    # 添加歌曲标题（如果有）
-                    if title:
-                        message_content.append(f"🎼 标题：{title}\n\n")
-                    
-                    # 添加歌词（如果有）
-                    if lyrics:
-                        message_content.append(f"📝 歌词：\n{lyrics}\n\n")
-                    
-                    # 添加歌曲链接
-                    message_content.append(f"🎵 歌曲链接：`{song_url}`")
-                    
-                    # 合并为完整消息
-                    full_message = "".join(message_content)
-                    
-                    # 下载图片封面（如果有）
-                    image_base64 = None
-                    if image_url:
-                        image_data = await suno_client.download_song(image_url)
+            # 下载并发送歌曲、图片封面和歌词
+            if song_url:
+                # 分块流式写入系统临时目录下的唯一文件，不在内存中保留完整的MP3，并发生成时也不会重名
+                fd, temp_file = tempfile.mkstemp(prefix="suno_", suffix=".mp3")
+                os.close(fd)
+                # 歌曲和封面互不依赖，封面与歌曲同时下载
+                image_task = asyncio.create_task(suno_client.download_song(image_url)) if image_url else None
+                song_downloaded = await suno_client.download_to_file(song_url, temp_file)
+                image_data = await image_task if image_task else None
+                
+                if song_downloaded:
+                    try:
+                        # 准备转发消息内容，作者、标题和歌词仅在存在时添加
+                        author_line = f"👤 作者：{author}\n" if author else ""
+                        title_line = f"🎼 标题：{title}\n\n" if title else ""
+                        lyrics_line = f"📝 歌词：\n{lyrics}\n\n" if lyrics else ""
+                        full_message = f"🎵 歌曲生成完成！\n{author_line}{title_line}{lyrics_line}🎵 歌曲链接：`{song_url}`"
+                        
+                        # 将图片封面转换为base64编码（如果有）
+                        image_base64 = None
                         if image_data:
-                            # 将图片转换为base64编码
                             image_base64 = base64.b64encode(image_data).decode('utf-8')
+                            
+                        # 构造转发消息格式 - 合并文本和图片
+                        forward_items = []
+                        
+                        # 添加文本消息
+                        forward_items.append(("text", full_message))
+                        
+                        # 添加图片消息（如果有）
+                        if image_base64:
+                            forward_items.append(("image", image_base64))
+                            
+                        # 构造完整的转发消息
+                        forward_messages = [
+                            ("123456", "Suno AI", forward_items)
+                        ]
+                        
+                        # 发送转发消息
+                        await self.send_forward(forward_messages)
+                        logger.info("转发消息发送成功")
+                        
+                        # 发送MP3文件
+                        mp3_sent = False
+                        send_method = _audio_send_method(type(self))
+                        try:
+                            if send_method == "send_file":
+                                # 直接发送MP3文件
+                                logger.info("直接发送MP3文件：%s", temp_file)
+                                await self.send_file(temp_file)
+                                mp3_sent = True
+                                logger.info("MP3文件发送成功")
+                            # 尝试使用send_voice方法发送base64编码的语音
+                            elif send_method == "send_voice":
+                                logger.info("send_file方法不可用，尝试使用send_voice方法发送语音")
+                                await self.send_voice(await asyncio.to_thread(_read_file_base64, temp_file))
+                                mp3_sent = True
+                                logger.info("语音文件发送成功")
+                            else:
+                                logger.info("send_file和send_voice方法都不可用，回退到发送歌曲链接")
+                                await self.send_text(f"🎵 歌曲链接：`{song_url}`")
+                        except Exception as e:
+                            logger.error("发送MP3失败: %s", e)
+                            # 最终回退到发送歌曲链接
+                            await self.send_text(f"🎵 歌曲链接：`{song_url}`")
+                    finally:
+                        # 删除临时文件
+                        await asyncio.to_thread(_remove_file, temp_file)
+                else:
+                    await asyncio.to_thread(_remove_file, temp_file)
                     
-                    # 构造转发消息格式 - 合并文本和图片
-                    forward_items = []
-                    
-                    # 添加文本消息
-                    forward_items.append(("text", full_message))
-                    
-                    # 添加图片消息（如果有）
-                    if image_base64:
-                        forward_items.append(("image", image_base64))
-                    
-                    # 构造完整的转发消息
-                    forward_messages = [
-                        ("123456", "Suno AI", forward_items)
-                    ]
-                    
-                    # 发送转发消息
-                    await self.send_forward(forward_messages)
-                    logger.info("转发消息发送成功")
+                    # 下载失败时的整合消息
+                    lyrics_line = f"📝 歌词：\n{lyrics}\n\n" if lyrics else ""
+                    image_line = f"🖼️ 歌曲封面链接：{image_url}\n\n" if image_url else ""
+                    error_message = f"❌ 下载歌曲失败\n\n{lyrics_line}{image_line}🎵 歌曲链接：{song_url}"
                     
-                    # 发送MP3文件
-                    mp3_sent = False
-                    try:
-                        # 检查send_file方法是否存在
-                        if hasattr(self, 'send_file'):
-                            # 直接发送MP3文件
-                            logger.info(f"直接发送MP3文件：{temp_file}")
-                            await self.send_file(temp_file)
-                            mp3_sent = True
-                            logger.info("MP3文件发送成功")
-                        # 尝试使用send_voice方法发送base64编码的语音
-                        elif hasattr(self, 'send_voice'):
-                            logger.info("send_file方法不可用，尝试使用send_voice方法发送语音")
-                            with open(temp_file, "rb") as f:
-                                mp3_data = f.read()
-                            await self.send_voice(base64.b64encode(mp3_data).decode('utf-8'))
-                            mp3_sent = True
-                            logger.info("语音文件发送成功")
-                        else:
-                            logger.info("send_file和send_voice方法都不可用，回退到发送歌曲链接")
-                            await self.send_text(f"🎵 歌曲链接：`{song_url}`")
-                    except Exception as e:
-                        logger.error(f"发送MP3失败: {str(e)}")
-                        # 最终回退到发送歌曲链接
-                        await self.send_text(f"🎵 歌曲链接：`{song_url}`")
-                finally:
-                    # 删除临时文件
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
+                    await self.send_text(error_message)
+                    return True, "下载歌曲失败", 1
             else:
-                # 下载失败时的整合消息
-                error_message = "❌ 下载歌曲失败\n\n"
-                if lyrics:
-                    error_message += f"📝 歌词：\n{lyrics}\n\n"
-                if image_url:
-                    error_message += f"🖼️ 歌曲封面链接：{image_url}\n\n"
-                if song_url:
-                    error_message += f"🎵 歌曲链接：{song_url}"
+                # 没有获取到song_url时的整合消息
+                lyrics_line = f"📝 歌词：\n{lyrics}\n\n" if lyrics else ""
+                image_line = f"🖼️ 歌曲封面链接：{image_url}" if image_url else ""
+                no_url_message = (
+                    f"🎵 歌曲生成完成！任务ID：{task_id}\n\n"
+                    "⚠️ 未能获取到歌曲下载链接，请稍后查看您的Suno账户或使用任务ID查询\n\n"
+                    f"{lyrics_line}{image_line}"
+                )
                 
-                await self.send_text(error_message)
-                return True, "下载歌曲失败", 1
-        else:
-            # 没有获取到song_url时的整合消息
-            no_url_message = f"🎵 歌曲生成完成！任务ID：{task_id}\n\n"
-            no_url_message += "⚠️ 未能获取到歌曲下载链接，请稍后查看您的Suno账户或使用任务ID查询\n\n"
-            
-            if lyrics:
-                no_url_message += f"📝 歌词：\n{lyrics}\n\n"
-            if image_url:
-                no_url_message += f"🖼️ 歌曲封面链接：{image_url}"
-            
-            await self.send_text(no_url_message)
-        
-        return True, "歌曲生成完成", 1
+                await self.send_text(no_url_message)
+                
+            return True, "歌曲生成完成", 1
 
 
-class SunoBalanceCommand(BaseCommand):
+class SunoBalanceCommand(_ConfigMixin, BaseCommand):
     """Suno AI账户余额命令"""
     command_name: str = "suno_balance"
     command_description: str = "查看Suno AI账户余额"
-    command_pattern: str = r"^/suno余额$|^/suno\s+余额$"
+    command_pattern: str = r"^/suno\s*余额$"
     
     async def execute(self) -> Tuple[bool, Optional[str], int]:
         """执行查看账户余额命令"""
         # 获取配置
-        api_base = self.get_config("api.api_base", "https://api.vectorengine.ai")
-        api_key = self.get_config("api.api_key", "")
-        default_account = self.get_config("accounts.default_account", "default")
-        accounts_list = self.get_config("accounts.accounts_list", "default:")
+        api_base = self._cfg("api.api_base")
+        api_key = self._cfg("api.api_key")
+        max_inflight = self._cfg("api.max_inflight")
+        use_http2 = self._cfg("api.use_http2")
+        default_account = self._cfg("accounts.default_account")
+        accounts_list = self._cfg("accounts.accounts_list")
         
         # 解析账户列表
-        accounts = {}
-        # 处理配置格式
-        cleaned_accounts_list = accounts_list.strip()
-        
-        # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
-        if "|" not in cleaned_accounts_list and ":" not in cleaned_accounts_list:
-            # 直接将整个内容作为默认账户的Cookie
-            accounts["default"] = cleaned_accounts_list
-            logger.info("检测到直接输入的Cookie，使用默认账户名")
-        else:
-            # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
-            for account_entry in cleaned_accounts_list.split("|"):
-                if account_entry.strip():
-                    parts = account_entry.split(":", 1)
-                    if len(parts) == 2:
-                        account_name, cookie = parts
-                        accounts[account_name.strip()] = cookie.strip()
-                    elif len(parts) == 1 and parts[0].strip():
-                        # 如果只有一个部分且不为空，假设是直接输入的Cookie
-                        accounts["default"] = parts[0].strip()
-                        logger.info("检测到直接输入的Cookie，使用默认账户名")
-                    else:
-                        # 跳过空的配置项
-                        logger.warning(f"跳过无效的账户配置: {account_entry}")
-        
-        # 显示所有账户的余额
-        for account_name, cookie in accounts.items():
-            # 创建Suno AI客户端
-            suno_client = SunoAIClient(cookie, api_base, api_key)
-            
-            # 获取账户余额
-            balance_data = await suno_client.get_balance()
+        accounts = parse_accounts(accounts_list)
+        connection_pool.retain(list(accounts.values()))
+        
+        # 并发查询所有账户的余额，再按配置顺序合并为一条消息发送
+        async def get_balance(cookie: str) -> Optional[Dict[str, Any]]:
+            async with connection_pool.lease(cookie, api_base, api_key, max_inflight, use_http2) as client:
+                return await client.get_balance()
+        
+        results = await asyncio.gather(*(get_balance(c) for c in accounts.values()), return_exceptions=True)
+        account_infos = []
+        for account_name, balance_data in zip(accounts, results):
+            if isinstance(balance_data, BaseException):
+                logger.error("获取账户 %s 余额异常: %s", account_name, balance_data)
+                balance_data = None
             if balance_data:
-                # 合并账户信息为一条消息
-                account_info = f"🔑 账户：{account_name}\n"
-                account_info += f"💰 余额：{balance_data.get('balance', '未知')}\n"
-                account_info += f"📅 有效期：{balance_data.get('expire_at', '永久')}"
-                await self.send_text(account_info)
+                account_infos.append(
+                    f"🔑 账户：{account_name}\n"
+                    f"💰 余额：{balance_data.get('balance', '未知')}\n"
+                    f"📅 有效期：{balance_data.get('expire_at', '永久')}"
+                )
             else:
-                await self.send_text(f"❌ 无法获取账户 {account_name} 的余额")
+                account_infos.append(f"❌ 无法获取账户 {account_name} 的余额")
+        if account_infos:
+            await self.send_text("\n\n".join(account_infos))
         
         return True, "查看账户余额完成", 1
 
 
-class SunoHistoryCommand(BaseCommand):
+class SunoHistoryCommand(_ConfigMixin, BaseCommand):
     """Suno AI历史记录命令"""
     command_name: str = "suno_history"
     command_description: str = "查看Suno AI历史生成记录"
-    command_pattern: str = r"^/suno历史$|^/suno\s+历史$"
+    command_pattern: str = r"^/suno\s*历史$"
     
     async def execute(self) -> Tuple[bool, Optional[str], int]:
         """执行查看历史记录命令"""
         # 获取配置
-        api_base = self.get_config("api.api_base", "https://api.vectorengine.ai")
-        api_key = self.get_config("api.api_key", "")
-        default_account = self.get_config("accounts.default_account", "default")
-        accounts_list = self.get_config("accounts.accounts_list", "default:")
+        api_base = self._cfg("api.api_base")
+        api_key = self._cfg("api.api_key")
+        max_inflight = self._cfg("api.max_inflight")
+        use_http2 = self._cfg("api.use_http2")
+        default_account = self._cfg("accounts.default_account")
+        accounts_list = self._cfg("accounts.accounts_list")
         
         # 解析账户列表
-        accounts = {}
-        # 处理配置格式
-        cleaned_accounts_list = accounts_list.strip()
-        
-        # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
-        if "|" not in cleaned_accounts_list and ":" not in cleaned_accounts_list:
-            # 直接将整个内容作为默认账户的Cookie
-            accounts["default"] = cleaned_accounts_list
-            logger.info("检测到直接输入的Cookie，使用默认账户名")
-        else:
-            # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
-            for account_entry in cleaned_accounts_list.split("|"):
-                if account_entry.strip():
-                    parts = account_entry.split(":", 1)
-                    if len(parts) == 2:
-                        account_name, cookie = parts
-                        accounts[account_name.strip()] = cookie.strip()
-                    elif len(parts) == 1 and parts[0].strip():
-                        # 如果只有一个部分且不为空，假设是直接输入的Cookie
-                        accounts["default"] = parts[0].strip()
-                        logger.info("检测到直接输入的Cookie，使用默认账户名")
-                    else:
-                        # 跳过空的配置项
-                        logger.warning(f"跳过无效的账户配置: {account_entry}")
+        accounts = parse_accounts(accounts_list)
+        connection_pool.retain(list(accounts.values()))
         
         # 选择账户
         selected_account = default_account
         selected_cookie = accounts.get(selected_account, "")
         
-        # 创建Suno AI客户端
-        suno_client = SunoAIClient(selected_cookie, api_base, api_key)
-        
-        # 获取历史记录
-        history = await suno_client.get_history(limit=10)
-        if history:
-            # 合并历史记录为一条消息
-            history_info = f"📜 账户 {selected_account} 的历史记录：\n\n"
-            for i, record in enumerate(history, 1):
-                history_info += f"{i}. {record.get('title', '无标题')}\n"
-                history_info += f"   类型：{record.get('music_type', 'song')} | 状态：{record.get('status', 'unknown')} | 生成时间：{record.get('created_at', 'unknown')}\n"
-                if record.get('song_url'):
-                    history_info += f"   下载链接：{record.get('song_url')}\n"
-                history_info += "\n"
-            await self.send_text(history_info)
-        else:
-            await self.send_text(f"❌ 无法获取账户 {selected_account} 的历史记录")
-        
-        return True, "查看历史记录完成", 1
+        # 获取Suno AI客户端，按账户缓存并跨命令复用
+        async with connection_pool.lease(selected_cookie, api_base, api_key, max_inflight, use_http2) as suno_client:
+            # 获取历史记录
+            history = await suno_client.get_history(limit=10)
+            if history:
+                # 合并历史记录为一条消息
+                parts = [f"📜 账户 {selected_account} 的历史记录：\n\n"]
+                for i, record in enumerate(history, 1):
+                    parts.append(f"{i}. {record.get('title', '无标题')}\n")
+                    parts.append(f"   类型：{record.get('music_type', 'song')} | 状态：{record.get('status', 'unknown')} | 生成时间：{record.get('created_at', 'unknown')}\n")
+                    if record.get('song_url'):
+                        parts.append(f"   下载链接：{record.get('song_url')}\n")
+                    parts.append("\n")
+                await self.send_text("".join(parts))
+            else:
+                await self.send_text(f"❌ 无法获取账户 {selected_account} 的历史记录")
+                
+            return True, "查看历史记录完成", 1
 
 
-class SunoLyricsCommand(BaseCommand):
+class SunoLyricsCommand(_ConfigMixin, _BatchSendMixin, BaseCommand):
     """Suno AI生成歌词命令"""
     command_name: str = "suno_lyrics"
     command_description: str = "使用Suno AI生成歌词"
@@ -1151,36 +1843,17 @@ class SunoLyricsCommand(BaseCommand):
             return True, "缺少歌词描述", 1
         
         # 获取配置
-        api_base = self.get_config("api.api_base", "https://api.vectorengine.ai")
-        api_key = self.get_config("api.api_key", "")
-        default_account = self.get_config("accounts.default_account", "default")
-        accounts_list = self.get_config("accounts.accounts_list", "default:")
+        api_base = self._cfg("api.api_base")
+        api_key = self._cfg("api.api_key")
+        max_inflight = self._cfg("api.max_inflight")
+        use_http2 = self._cfg("api.use_http2")
+        notify_hook = self._cfg("notify.public_url") if notify_hub.running else ""
+        default_account = self._cfg("accounts.default_account")
+        accounts_list = self._cfg("accounts.accounts_list")
         
         # 解析账户列表
-        accounts = {}
-        # 处理配置格式
-        cleaned_accounts_list = accounts_list.strip()
-        
-        # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
-        if "|" not in cleaned_accounts_list and ":" not in cleaned_accounts_list:
-            # 直接将整个内容作为默认账户的Cookie
-            accounts["default"] = cleaned_accounts_list
-            logger.info("检测到直接输入的Cookie，使用默认账户名")
-        else:
-            # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
-            for account_entry in cleaned_accounts_list.split("|"):
-                if account_entry.strip():
-                    parts = account_entry.split(":", 1)
-                    if len(parts) == 2:
-                        account_name, cookie = parts
-                        accounts[account_name.strip()] = cookie.strip()
-                    elif len(parts) == 1 and parts[0].strip():
-                        # 如果只有一个部分且不为空，假设是直接输入的Cookie
-                        accounts["default"] = parts[0].strip()
-                        logger.info("检测到直接输入的Cookie，使用默认账户名")
-                    else:
-                        # 跳过空的配置项
-                        logger.warning(f"跳过无效的账户配置: {account_entry}")
+        accounts = parse_accounts(accounts_list)
+        connection_pool.retain(list(accounts.values()))
         
         # 选择账户
         selected_account = default_account
@@ -1188,94 +1861,125 @@ class SunoLyricsCommand(BaseCommand):
         
         # 检查API密钥
         if not api_key:
-            await self.send_text("❌ 生成歌词失败：未配置API密钥")
-            await self.send_text("请在配置文件中设置有效的Vector Engine API密钥")
-            await self.send_text("配置文件位置：plugins/suno_ai/config.toml")
+            await self.send_text(
+                "❌ 生成歌词失败：未配置API密钥\n"
+                "请在配置文件中设置有效的Vector Engine API密钥\n"
+                "配置文件位置：plugins/suno_ai/config.toml"
+            )
             return True, "未配置API密钥", 1
         
-        # 创建Suno AI客户端
-        suno_client = SunoAIClient(selected_cookie, api_base, api_key)
-        
-        try:
-            # 生成歌词
-            task_id = await suno_client.generate_lyrics(prompt)
-            if not task_id:
-                await self.send_text("❌ 生成歌词失败，请检查配置或稍后重试")
-                await self.send_text("错误详情：请查看日志获取更多信息")
-                return True, "生成歌词失败", 1
-            
-            # 合并所有状态消息为一条
-            status_message = f"✍️ 正在生成歌词：{prompt}...\n"
-            status_message += f"🔑 使用账户：{selected_account}\n"
-            status_message += f"🌐 使用API：Vector Engine API\n"
-            status_message += f"🔄 歌词生成中，任务ID：{task_id}，请稍候..."
-            
-            # 发送合并后的状态消息
-            await self.send_text(status_message)
-            
-            # 轮询任务状态
-            max_wait_time = 120  # 最大等待时间2分钟
-            start_time = time.time()
-            lyrics_url = None
-            consecutive_errors = 0
-            max_consecutive_errors = 3
-            
-            while time.time() - start_time < max_wait_time:
-                await asyncio.sleep(5)  # 每5秒查询一次
-                
-                task_status = await suno_client.get_task_status(task_id)
-                if task_status.get("success"):
-                    consecutive_errors = 0  # 重置错误计数
-                    data = task_status.get("data", {})
-                    status = data.get("status")
+        # 获取Suno AI客户端，按账户缓存并跨命令复用
+        async with connection_pool.lease(selected_cookie, api_base, api_key, max_inflight, use_http2) as suno_client:
+            try:
+                # 生成歌词
+                task_id = await suno_client.generate_lyrics(prompt, notify_hook=notify_hook)
+                if not task_id:
+                    await self.send_text(
+                        "❌ 生成歌词失败，请检查配置或稍后重试\n"
+                        "错误详情：请查看日志获取更多信息"
+                    )
+                    return True, "生成歌词失败", 1
                     
-                    if status == "SUCCESS":
-                        lyrics_url = data.get("lyrics_url")
-                        if lyrics_url:
-                            await self.send_text(f"📝 歌词生成完成！下载链接：{lyrics_url}")
+                # 合并所有状态消息为一条
+                status_message = (
+                    f"✍️ 正在生成歌词：{prompt}...\n"
+                    f"🔑 使用账户：{selected_account}\n"
+                    "🌐 使用API：Vector Engine API\n"
+                    f"🔄 歌词生成中，任务ID：{task_id}，请稍候..."
+                )
+                
+                # 发送合并后的状态消息
+                await self.send_text(status_message)
+                
+                # 轮询任务状态
+                max_wait_time = 120  # 最大等待时间2分钟
+                deadline = time.monotonic() + max_wait_time  # 使用单调时钟，不受系统时间调整影响；状态查询（含重试）也不能超过该截止时间
+                lyrics_url = None
+                consecutive_errors = 0
+                max_consecutive_errors = 3
+                # 配置了notify_hook时，回调到达会提前唤醒轮询，轮询仅作为兜底
+                notify_future = notify_hub.register(task_id) if notify_hook else None
+                last_progress = None
+                
+                try:
+                    while time.monotonic() < deadline:
+                        # 等待共享轮询器的下一次查询结果，不单独轮询
+                        watch_future = status_watcher.watch(suno_client, task_id)
+                        waiters = {watch_future}
+                        if notify_future is not None and not notify_future.done():
+                            waiters.add(notify_future)
+                        await asyncio.wait(waiters, timeout=deadline - time.monotonic(), return_when=asyncio.FIRST_COMPLETED)
+                        
+                        if watch_future.done():
+                            task_status = watch_future.result()
                         else:
-                            await self.send_text(f"📝 歌词生成完成！任务ID：{task_id}")
-                        break
-                    elif status == "FAILED":
-                        await self.send_text("歌词生成失败")
-                        return True, "歌词生成失败", 1
-                    elif status == "PROCESSING":
-                        progress = data.get("progress", 0)
-                        await self.send_text(f"⏳ 歌词生成中，进度：{progress}%")
-                else:
-                    consecutive_errors += 1
-                    error = task_status.get("error", "未知错误")
-                    
-                    if error == "HTML_RESPONSE":
-                        await self.send_text("⚠️ API返回了HTML页面，请检查API地址是否正确")
-                        await self.send_text("📌 建议尝试不同的API基础地址：")
-                        await self.send_text("   1. https://api.vectorengine.ai")
-                        await self.send_text("   2. https://api.vectorengine.ai/v1")
-                        await self.send_text("   3. https://api.vectorengine.ai/v1/chat/completions")
-                        return True, "API地址错误", 1
-                    elif error == "JSON_DECODE_ERROR":
-                        await self.send_text("⚠️ API返回了无效的JSON格式")
+                            watch_future.cancel()
+                            if not (notify_future is not None and notify_future.done()):
+                                continue  # 已到截止时间
+                            # 回调先到达，立即单独查询一次
+                            async with connection_pool.status_sem:
+                                task_status = await suno_client.get_task_status(task_id, deadline=deadline)
+                        if task_status.get("success"):
+                            consecutive_errors = 0  # 重置错误计数
+                            data = task_status.get("data") or _EMPTY_DATA
+                            status = data.get("status")
+                            
+                            if status == "SUCCESS":
+                                lyrics_url = data.get("lyrics_url")
+                                if lyrics_url:
+                                    await self.send_text(f"📝 歌词生成完成！下载链接：{lyrics_url}")
+                                else:
+                                    await self.send_text(f"📝 歌词生成完成！任务ID：{task_id}")
+                                break
+                            elif status == "FAILED":
+                                await self.send_text("歌词生成失败")
+                                return True, "歌词生成失败", 1
+                            elif status == "PROCESSING":
+                                progress = data.get("progress", 0)
+                                # 进度变化时才通知用户
+                                if progress != last_progress:
+                                    last_progress = progress
+                                    await self.send_text(f"⏳ 歌词生成中，进度：{progress}%")
+                        else:
+                            error = str(task_status.get("error") or "未知错误")
+                            
+                            if task_status.get("code") in _RETRY_STATUSES:
+                                # 限流或服务端临时错误：不计入连续失败次数，继续轮询直到超时
+                                logger.warning("获取任务状态暂时失败(%s)，%.1f秒后重试", error, status_watcher.delay)
+                            elif error == "HTML_RESPONSE":
+                                await self.send_text_batch(_HTML_RESPONSE_HINT)
+                                return True, "API地址错误", 1
+                            elif not task_status.get("retryable", True):
+                                # 不可恢复的错误（如认证失败、任务不存在），立即终止而不是等满连续失败次数
+                                await self.send_text(f"❌ 获取任务状态失败：{error}，终止轮询")
+                                return True, "获取任务状态失败", 1
+                            else:
+                                consecutive_errors += 1
+                                lines = ["⚠️ API返回了无效的JSON格式" if error == "JSON_DECODE_ERROR" else f"⚠️ 获取任务状态失败：{error}"]
+                                if consecutive_errors >= max_consecutive_errors:
+                                    lines.append(f"❌ 连续{max_consecutive_errors}次获取任务状态失败，终止轮询")
+                                    await self.send_text_batch(lines)
+                                    return True, "获取任务状态失败", 1
+                                await self.send_text_batch(lines)
                     else:
-                        await self.send_text(f"⚠️ 获取任务状态失败：{error}")
+                        # 等待超过截止时间仍未完成
+                        await self.send_text("歌词生成超时，请稍后重试")
+                        return True, "歌词生成超时", 1
+                finally:
+                    if notify_future is not None:
+                        notify_hub.discard(task_id)
                     
-                    if consecutive_errors >= max_consecutive_errors:
-                        await self.send_text(f"❌ 连续{max_consecutive_errors}次获取任务状态失败，终止轮询")
-                        return True, "获取任务状态失败", 1
-                
-                # 检查是否超时
-                if time.time() - start_time >= max_wait_time:
-                    await self.send_text("歌词生成超时，请稍后重试")
-                    return True, "歌词生成超时", 1
-            
-            return True, "歌词生成完成", 1
-        except Exception as e:
-            logger.error(f"生成歌词异常: {str(e)}")
-            await self.send_text(f"❌ 生成歌词过程中发生错误: {str(e)}")
-            await self.send_text("请检查日志获取详细信息")
-            return True, f"生成歌词异常: {str(e)}", 1
+                return True, "歌词生成完成", 1
+            except Exception as e:
+                logger.error("生成歌词异常: %s", e)
+                await self.send_text(
+                    f"❌ 生成歌词过程中发生错误: {str(e)}\n"
+                    "请检查日志获取详细信息"
+                )
+                return True, f"生成歌词异常: {str(e)}", 1
 
 
-class SunoSwitchAccountCommand(BaseCommand):
+class SunoSwitchAccountCommand(_ConfigMixin, BaseCommand):
     """Suno AI切换账户命令"""
     command_name: str = "suno_switch_account"
     command_description: str = "切换Suno AI默认账户"
@@ -1289,45 +1993,44 @@ class SunoSwitchAccountCommand(BaseCommand):
             return True, "缺少账户名称", 1
         
         # 获取配置
-        accounts_list = self.get_config("accounts.accounts_list", "default:")
+        accounts_list = self._cfg("accounts.accounts_list")
         
         # 解析账户列表
-        accounts = {}
-        # 处理配置格式
-        cleaned_accounts_list = accounts_list.strip()
-        
-        # 如果没有竖线分隔符，也没有冒号，假设用户直接输入了Cookie
-        if "|" not in cleaned_accounts_list and ":" not in cleaned_accounts_list:
-            # 直接将整个内容作为默认账户的Cookie
-            accounts["default"] = cleaned_accounts_list
-            logger.info("检测到直接输入的Cookie，使用默认账户名")
-        else:
-            # 使用竖线|作为账户分隔符，因为Cookie本身包含分号;
-            for account_entry in cleaned_accounts_list.split("|"):
-                if account_entry.strip():
-                    parts = account_entry.split(":", 1)
-                    if len(parts) == 2:
-                        acc_name, cookie = parts
-                        accounts[acc_name.strip()] = cookie.strip()
-                    elif len(parts) == 1 and parts[0].strip():
-                        # 如果只有一个部分且不为空，假设是直接输入的Cookie
-                        accounts["default"] = parts[0].strip()
-                        logger.info("检测到直接输入的Cookie，使用默认账户名")
-                    else:
-                        # 跳过空的配置项
-                        logger.warning(f"跳过无效的账户配置: {account_entry}")
+        accounts = parse_accounts(accounts_list)
         
         if account_name not in accounts:
             await self.send_text(f"❌ 账户 {account_name} 不存在")
             return True, "账户不存在", 1
         
         # 这里无法直接修改配置，提示用户手动修改
-        await self.send_text(f"✅ 请手动修改配置文件中的default_account为：{account_name}")
-        await self.send_text(f"📄 配置文件位置：plugins/suno_ai/config.toml")
+        await self.send_text(
+            f"✅ 请手动修改配置文件中的default_account为：{account_name}\n"
+            "📄 配置文件位置：plugins/suno_ai/config.toml"
+        )
         
         return True, "切换账户完成", 1
 
 
+# 帮助信息内容固定，导入时构建一次
+_HELP_MESSAGE = "\n".join([
+    "🎵 Suno AI插件帮助信息",
+    "=" * 30,
+    "📋 可用命令：",
+    "/suno 或 #作曲 [提示词] - 生成歌曲",
+    "/suno 或 #写词 [提示词] - 生成歌词",
+    "/suno余额 - 查看账户余额",
+    "/suno历史 - 查看历史生成记录",
+    "/切换账户 [账户名] - 切换默认账户",
+    "/suno - 显示本帮助信息",
+    "=" * 30,
+    "💡 提示：",
+    "- 歌曲生成可能需要几分钟时间，请耐心等待",
+    "- 歌词生成通常较快，约30秒左右",
+    "- 可以在配置文件中设置多个账户",
+    "- 支持多种模型版本，默认使用最新模型",
+])
+
+
 class SunoHelpCommand(BaseCommand):
     """Suno AI帮助命令"""
     command_name: str = "suno_help"
@@ -1336,31 +2039,13 @@ class SunoHelpCommand(BaseCommand):
     
     async def execute(self) -> Tuple[bool, Optional[str], int]:
         """执行帮助命令"""
-        # 合并所有帮助信息为一个字符串
-        help_message = "🎵 Suno AI插件帮助信息\n"
-        help_message += "=" * 30 + "\n"
-        help_message += "📋 可用命令：\n"
-        help_message += "/suno 或 #作曲 [提示词] - 生成歌曲\n"
-        help_message += "/suno 或 #写词 [提示词] - 生成歌词\n"
-        help_message += "/suno余额 - 查看账户余额\n"
-        help_message += "/suno历史 - 查看历史生成记录\n"
-        help_message += "/切换账户 [账户名] - 切换默认账户\n"
-        help_message += "/suno - 显示本帮助信息\n"
-        help_message += "=" * 30 + "\n"
-        help_message += "💡 提示：\n"
-        help_message += "- 歌曲生成可能需要几分钟时间，请耐心等待\n"
-        help_message += "- 歌词生成通常较快，约30秒左右\n"
-        help_message += "- 可以在配置文件中设置多个账户\n"
-        help_message += "- 支持多种模型版本，默认使用最新模型"
-        
-        # 一次性发送所有帮助信息
-        await self.send_text(help_message)
+        await self.send_text(_HELP_MESSAGE)
         
         return True, "显示帮助信息完成", 1
 
 
 @register_plugin
-class SunoAIPlugin(BasePlugin):
+class SunoAIPlugin(_ConfigMixin, BasePlugin):
     # 插件基本信息
     plugin_name = "suno_ai"
     plugin_description = "使用Suno AI生成AI歌曲"
@@ -1388,6 +2073,38 @@ class SunoAIPlugin(BasePlugin):
                 description="使用的模型名称，支持: chirp-v3-0, chirp-v3-5, chirp-v4, chirp-auk, chirp-v5",
                 type="string",
                 default="chirp-v4"
+            ),
+            "max_inflight": ConfigField(
+                description="同时进行的最大API请求数，同时作为每个主机的连接数上限",
+                type="integer",
+                default=8
+            ),
+            "use_http2": ConfigField(
+                description="是否通过HTTP/2在单个连接上复用API请求，需要安装 httpx[http2]，未安装时回退到aiohttp",
+                type="boolean",
+                default=False
+            )
+        },
+        "notify": {
+            "enabled": ConfigField(
+                description="是否启用notify_hook回调服务，启用后任务完成时由API主动通知，轮询仅作为兜底",
+                type="boolean",
+                default=False
+            ),
+            "host": ConfigField(
+                description="回调服务监听地址",
+                type="string",
+                default="0.0.0.0"
+            ),
+            "port": ConfigField(
+                description="回调服务监听端口",
+                type="integer",
+                default=8765
+            ),
+            "public_url": ConfigField(
+                description="API可访问的回调地址，例如 http://your-host:8765/suno/notify",
+                type="string",
+                default=""
             )
         },
         "accounts": {
@@ -1438,8 +2155,28 @@ class SunoAIPlugin(BasePlugin):
     
     async def on_enable(self):
         """插件启用时执行"""
+        connection_pool.start(self._cfg("api.max_inflight"))
+        if self._cfg("notify.enabled"):
+            try:
+                await notify_hub.start(
+                    self._cfg("notify.host"),
+                    self._cfg("notify.port"),
+                )
+            except OSError as e:
+                logger.error("启动notify_hook回调服务失败: %s", e)
         logger.info("SunoAIPlugin 已启用")
     
     async def on_disable(self):
         """插件禁用时执行"""
+        await notify_hub.stop()
+        await status_watcher.stop()
+        await connection_pool.stop()
         logger.info("SunoAIPlugin 已禁用")
+
+
+# config_schema各项默认值的扁平表，键为"分组.配置项"，类定义后只构建一次
+_CONFIG_DEFAULTS: Dict[str, Any] = {
+    f"{section}.{key}": field.default
+    for section, fields in SunoAIPlugin.config_schema.items()
+    for key, field in fields.items()
+}
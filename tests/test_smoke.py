@@ -0,0 +1,489 @@
+"""针对本地aiohttp服务的冒烟测试：验证提交任务和查询任务状态的完整请求流程
+
+运行：python -m unittest discover -s tests
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+
+try:
+    import httpx
+except ImportError:  # HTTP/2为可选功能
+    httpx = None
+from aiohttp.test_utils import TestServer
+
+
+def _install_host_stubs():
+    """测试环境没有MaiBot宿主，注册插件导入所需的最小模块"""
+    if "src.plugin_system" in sys.modules:
+        return
+
+    class ConfigField:
+        def __init__(self, description="", type="string", default=None):
+            self.description = description
+            self.type = type
+            self.default = default
+
+    class _Base:
+        def get_config(self, key, default=None):
+            return default
+
+    plugin_system = types.ModuleType("src.plugin_system")
+    plugin_system.BasePlugin = _Base
+    plugin_system.BaseCommand = _Base
+    plugin_system.ComponentInfo = object
+    plugin_system.ConfigField = ConfigField
+    plugin_system.register_plugin = lambda cls: cls
+    message = types.ModuleType("src.chat.message_receive.message")
+    message.MessageRecv = object
+    for name in ("src", "src.chat", "src.chat.message_receive"):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    sys.modules["src.plugin_system"] = plugin_system
+    sys.modules["src.chat.message_receive.message"] = message
+
+
+_install_host_stubs()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import plugin  # noqa: E402
+
+
+class SunoAIClientSmokeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.submitted = []
+
+        async def submit(request):
+            self.submitted.append(await request.json())
+            return web.json_response({"code": "success", "data": "task-1"})
+
+        async def fetch(request):
+            return web.json_response({
+                "code": "success",
+                "data": {
+                    "task_id": request.match_info["task_id"],
+                    "status": "SUCCESS",
+                    "data": [{
+                        "id": "clip-1",
+                        "audio_url": "https://cdn.example.com/clip-1.mp3",
+                        "image_url": "https://cdn.example.com/clip-1.jpg",
+                        "title": "测试",
+                    }],
+                },
+            })
+
+        async def submit_lyrics(request):
+            self.submitted.append(await request.json())
+            return web.json_response({"code": "error", "message": "busy"}, status=502)
+
+        self.batch_calls = 0
+        self.batch_response = ({"code": "error"}, 400)
+
+        async def fetch_batch(request):
+            self.batch_calls += 1
+            body, status = self.batch_response
+            return web.json_response(body, status=status)
+
+        self.song_bytes = os.urandom(3 * 1024 * 1024 + 123)
+
+        async def song(request):
+            return web.Response(body=self.song_bytes, content_type="audio/mpeg")
+
+        app = web.Application()
+        app.router.add_post("/suno/submit/music", submit)
+        app.router.add_post("/suno/submit/lyrics", submit_lyrics)
+        app.router.add_get("/suno/fetch/{task_id}", fetch)
+        app.router.add_post("/suno/fetch", fetch_batch)
+        app.router.add_get("/files/song.mp3", song)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = plugin.SunoAIClient("cookie", api_base=str(self.server.make_url("")).rstrip("/"), api_key="key")
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_submit_and_fetch(self):
+        task_id = await self.client.generate_song("一首关于春天的歌")
+        self.assertEqual(task_id, "task-1")
+        self.assertEqual(len(self.submitted), 1)
+
+        status = await self.client.get_task_status(task_id)
+        self.assertTrue(status["success"], status)
+        self.assertEqual(status["data"]["status"], "SUCCESS")
+        self.assertEqual(status["data"]["song_url"], "https://cdn.example.com/clip-1.mp3")
+
+    async def test_submit_not_retried_on_server_error(self):
+        self.assertIsNone(await self.client.generate_lyrics("春天"))
+        self.assertEqual(len(self.submitted), 1)
+
+    async def test_failed_batch_fetch_is_not_retried_every_call(self):
+        for _ in range(2):
+            results = await self.client.get_task_status_batch(["task-1", "task-2"])
+            self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(self.batch_calls, 1)
+
+    async def test_batch_probe_uses_own_breaker_without_retries(self):
+        self.batch_response = ({"code": "error"}, 503)
+        await self.client.get_task_status_batch(["task-1"])
+        self.assertEqual(self.batch_calls, 1)
+        self.assertEqual(self.client._get_circuit_breaker("fetch").failure_count, 0)
+        self.assertEqual(self.client._get_circuit_breaker("fetch_batch").failure_count, 1)
+
+    async def test_batch_results_without_ids_are_not_matched_by_position(self):
+        self.batch_response = ({"code": "success", "data": [{"status": "FAILURE"}]}, 200)
+        results = await self.client.get_task_status_batch(["task-1"])
+        self.assertEqual(results[0]["data"]["status"], "SUCCESS")
+        self.assertIs(self.client._supports_batch_fetch, False)
+
+    async def test_expired_deadline_does_not_count_as_endpoint_failure(self):
+        with self.assertRaises(plugin.DeadlineExceededError):
+            await self.client._request_with_retry("GET", self.client.api_base + "/suno/fetch/task-1", "fetch", deadline=0)
+        self.assertEqual(self.client._get_circuit_breaker("fetch").failure_count, 0)
+
+    async def test_download_to_file_writes_whole_body(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(plugin._remove_file, path)
+        self.assertTrue(await self.client.download_to_file(str(self.server.make_url("/files/song.mp3")), path))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.song_bytes)
+
+    async def test_download_to_file_removes_file_on_http_error(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(plugin._remove_file, path)
+        self.assertFalse(await self.client.download_to_file(str(self.server.make_url("/files/missing.mp3")), path))
+        self.assertFalse(os.path.exists(path))
+
+    async def test_http2_requests_do_not_open_aiohttp_session(self):
+        async def send_http2(method, url, timeout, **kwargs):
+            return plugin._BufferedResponse(200, {}, b"{}", "utf-8")
+
+        self.client.use_http2 = True
+        self.client._get_http2_client = lambda: object()
+        self.client._send_http2 = send_http2
+        response = await self.client._request_with_retry("GET", self.client.api_base + "/suno/fetch/task-1", "fetch")
+        self.assertEqual(response.status, 200)
+        self.assertIsNone(self.client._session)
+
+    async def test_leader_cancellation_does_not_cancel_followers(self):
+        leader = asyncio.ensure_future(self.client.get_task_status("task-1"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(self.client.get_task_status("task-1"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        status = await follower
+        self.assertTrue(status["success"], status)
+
+
+@unittest.skipIf(httpx is None, "未安装httpx")
+class SendHttp2Test(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = plugin.SunoAIClient("cookie", api_key="key")
+        self.timeout = aiohttp.ClientTimeout(total=5, connect=1, sock_read=2)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    def _transport(self, handler):
+        self.client._http2_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def test_response_is_buffered_and_data_sent_as_content(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content)
+            return httpx.Response(200, json={"code": "success"})
+
+        self._transport(handler)
+        response = await self.client._send_http2("POST", "https://api.example.com/suno/fetch", self.timeout, data=b'{"ids": []}')
+        self.assertEqual(bodies, [b'{"ids": []}'])
+        self.assertTrue(response.ok)
+        self.assertEqual(plugin._loads(await response.read()), {"code": "success"})
+
+    async def test_exceptions_are_mapped_to_aiohttp_errors(self):
+        cases = [
+            (httpx.ConnectError("refused"), plugin._ConnectError),
+            (httpx.ConnectTimeout("timeout"), plugin._ConnectError),
+            (httpx.ReadError("reset"), aiohttp.ClientConnectionError),
+            (httpx.TooManyRedirects("loop"), aiohttp.ClientError),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=type(error).__name__):
+                def handler(request, error=error):
+                    raise error
+
+                self._transport(handler)
+                with self.assertRaises(expected) as ctx:
+                    await self.client._send_http2("GET", "https://api.example.com/suno/fetch/task-1", self.timeout)
+                if expected is not plugin._ConnectError:
+                    self.assertNotIsInstance(ctx.exception, plugin._ConnectError)
+                await self.client._http2_client.aclose()
+
+
+class NotifyHubTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hub = plugin.SunoNotifyHub()
+        app = web.Application()
+        app.router.add_post("/suno/notify", self.hub.handle_notify)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+        await self.hub.stop()
+
+    async def _notify(self, body):
+        async with self.session.post(self.server.make_url("/suno/notify"), data=body) as response:
+            return response.status
+
+    async def test_callback_wakes_only_matching_task(self):
+        first = self.hub.register("task-1")
+        second = self.hub.register("task-2")
+        self.assertIs(self.hub.register("task-1"), first)
+        self.assertEqual(await self._notify('{"data": {"task_id": "task-2", "status": "SUCCESS"}}'), 200)
+        self.assertEqual(await second, {"task_id": "task-2", "status": "SUCCESS"})
+        self.assertFalse(first.done())
+        self.assertEqual(await self._notify('{"id": "task-1"}'), 200)
+        self.assertEqual(await first, {"id": "task-1"})
+
+    async def test_invalid_json_is_rejected(self):
+        fut = self.hub.register("task-1")
+        self.assertEqual(await self._notify("not json"), 400)
+        self.assertFalse(fut.done())
+
+    async def test_discard_cancels_and_ignores_late_callback(self):
+        fut = self.hub.register("task-1")
+        self.hub.discard("task-1")
+        self.assertTrue(fut.cancelled())
+        self.assertEqual(await self._notify('{"task_id": "task-1"}'), 200)
+        self.assertIsNot(self.hub.register("task-1"), fut)
+
+
+class ParseAccountsTest(unittest.TestCase):
+    def test_named_accounts_keep_colons_and_semicolons_in_cookie(self):
+        self.assertEqual(
+            plugin.parse_accounts("a: sid=x; uid=y | b:token:z"),
+            {"a": "sid=x; uid=y", "b": "token:z"},
+        )
+
+    def test_bare_cookie_uses_default_account(self):
+        self.assertEqual(plugin.parse_accounts(" sid=abc "), {"default": "sid=abc"})
+        self.assertEqual(plugin.parse_accounts("a:c1|sid=abc"), {"a": "c1", "default": "sid=abc"})
+
+    def test_empty_segments_skipped_and_later_duplicates_win(self):
+        self.assertEqual(plugin.parse_accounts("a:c1||a:c2 |"), {"a": "c2"})
+
+
+class SendTextBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_lines_sent_as_one_message_without_blanks(self):
+        sent = []
+
+        class Command(plugin._BatchSendMixin):
+            async def send_text(self, text):
+                sent.append(text)
+
+        command = Command()
+        await command.send_text_batch(["第一行", "", "第二行"])
+        await command.send_text_batch(["", ""])
+        self.assertEqual(sent, ["第一行\n第二行"])
+
+
+class ParseTaskDataTest(unittest.TestCase):
+    def test_status_from_json_string(self):
+        client = plugin.SunoAIClient("cookie")
+        result = client._parse_task_data('{"status": "SUCCESS", "audio_url": "https://cdn.example.com/a.mp3"}')
+        self.assertEqual(result["data"]["status"], "SUCCESS")
+        self.assertEqual(result["data"]["song_url"], "https://cdn.example.com/a.mp3")
+
+    def test_resources_come_from_first_clip(self):
+        client = plugin.SunoAIClient("cookie")
+        result = client._parse_task_data({
+            "status": "SUCCESS",
+            "data": [
+                {"id": "clip-1", "title": "第一首"},
+                {"id": "clip-2", "audio_url": "https://cdn.example.com/clip-2.mp3", "image_url": "https://cdn.example.com/clip-2.jpg"},
+            ],
+        })
+        self.assertEqual(result["data"]["clip_id"], "clip-1")
+        self.assertIsNone(result["data"]["song_url"])
+        self.assertIsNone(result["data"]["image_url"])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_half_open_admits_single_probe(self):
+        breaker = plugin._CircuitBreaker(fail_max=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertFalse(breaker.is_open())
+        self.assertTrue(breaker.is_open())
+        breaker.record_success()
+        self.assertFalse(breaker.is_open())
+        self.assertFalse(breaker.is_open())
+
+
+class ConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pool = plugin.SunoConnectionPool()
+        self.closed = []
+
+    async def asyncTearDown(self):
+        await self.pool.stop()
+
+    def _track(self, client):
+        async def close():
+            self.closed.append(client)
+        client.close = close
+        return client
+
+    async def test_retired_client_closed_after_last_lease(self):
+        async with self.pool.lease("cookie", "https://a", "key-1") as old:
+            self._track(old)
+            async with self.pool.lease("cookie", "https://a", "key-2") as new:
+                self.assertIsNot(new, old)
+                await asyncio.sleep(0)
+                self.assertEqual(self.closed, [])
+        await asyncio.sleep(0)
+        self.assertEqual(self.closed, [old])
+
+    async def test_stop_closes_retired_clients_still_in_use(self):
+        async with self.pool.lease("cookie", "https://a", "key-1") as old:
+            self._track(old)
+            async with self.pool.lease("cookie", "https://a", "key-2") as new:
+                self._track(new)
+                await self.pool.stop()
+                self.assertCountEqual(self.closed, [old, new])
+
+    async def test_retain_drops_unconfigured_idle_clients(self):
+        async with self.pool.lease("cookie-1", "https://a", "key") as first:
+            self._track(first)
+        async with self.pool.lease("cookie-2", "https://a", "key") as second:
+            self._track(second)
+        self.pool.retain(["cookie-2"])
+        await asyncio.sleep(0)
+        self.assertEqual(self.closed, [first])
+        async with self.pool.lease("cookie-2", "https://a", "key") as again:
+            self.assertIs(again, second)
+
+
+class _FakeStatusClient:
+    """只实现get_task_status_batch的客户端，记录每次批量查询的任务ID"""
+    def __init__(self, watcher, status="IN_PROGRESS"):
+        self.watcher = watcher
+        self.status = status
+        self.calls = []
+        # 每次查询开始时轮询器的等待时间，即本轮查询前实际等待的时间
+        self.delays = []
+        self.gate = None
+
+    async def get_task_status_batch(self, task_ids):
+        self.calls.append(list(task_ids))
+        self.delays.append(self.watcher.delay)
+        if self.gate is not None:
+            await self.gate.wait()
+        return [{"success": True, "data": {"task_id": task_id, "status": self.status, "progress": 50}} for task_id in task_ids]
+
+
+class SunoStatusWatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        for name, value in (("_WATCH_INITIAL_DELAY", 0.01), ("_WATCH_MAX_DELAY", 0.04)):
+            patcher = mock.patch.object(plugin, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.watcher = plugin.SunoStatusWatcher()
+
+    async def asyncTearDown(self):
+        await self.watcher.stop()
+
+    async def test_batches_tasks_per_client_and_wakes_waiters(self):
+        first = _FakeStatusClient(self.watcher)
+        second = _FakeStatusClient(self.watcher, status="SUCCESS")
+        results = await asyncio.gather(
+            self.watcher.watch(first, "task-1"),
+            self.watcher.watch(first, "task-2"),
+            self.watcher.watch(first, "task-2"),
+            self.watcher.watch(second, "task-3"),
+        )
+        self.assertEqual(first.calls, [["task-1", "task-2"]])
+        self.assertEqual(second.calls, [["task-3"]])
+        self.assertEqual([r["data"]["task_id"] for r in results], ["task-1", "task-2", "task-2", "task-3"])
+        self.assertEqual(results[3]["data"]["status"], "SUCCESS")
+
+    async def test_backoff_doubles_until_state_changes(self):
+        client = _FakeStatusClient(self.watcher)
+        for _ in range(5):
+            await self.watcher.watch(client, "task-1")
+        client.status = "SUCCESS"
+        for _ in range(2):
+            await self.watcher.watch(client, "task-1")
+        self.assertEqual(client.delays, [0.01, 0.01, 0.02, 0.04, 0.04, 0.04, 0.01])
+
+    async def test_exit_clears_last_state(self):
+        client = _FakeStatusClient(self.watcher)
+        await self.watcher.watch(client, "task-1")
+        await self.watcher._task
+        self.assertEqual(self.watcher._last, {})
+
+    async def test_stop_cancels_waiters(self):
+        client = _FakeStatusClient(self.watcher)
+        client.gate = asyncio.Event()
+        polling = self.watcher.watch(client, "task-1")
+        while not client.calls:
+            await asyncio.sleep(0.01)
+        pending = self.watcher.watch(client, "task-2")
+        await self.watcher.stop()
+        self.assertTrue(polling.cancelled())
+        self.assertTrue(pending.cancelled())
+
+
+class LyricsCommandTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(plugin, "_WATCH_INITIAL_DELAY", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.statuses = ["IN_PROGRESS", "IN_PROGRESS", "SUCCESS"]
+
+        async def submit_lyrics(request):
+            return web.json_response({"code": "success", "data": "task-9"})
+
+        async def fetch_batch(request):
+            ids = (await request.json())["ids"]
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            return web.json_response({"code": "success", "data": [{"task_id": task_id, "status": status} for task_id in ids]})
+
+        app = web.Application()
+        app.router.add_post("/suno/submit/lyrics", submit_lyrics)
+        app.router.add_post("/suno/fetch", fetch_batch)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        config = {"api.api_base": str(self.server.make_url("")).rstrip("/"), "api.api_key": "key"}
+        self.sent = []
+
+        async def send_text(text):
+            self.sent.append(text)
+
+        self.command = plugin.SunoLyricsCommand()
+        self.command.matched_groups = {"prompt": "春天"}
+        self.command.get_config = lambda key, default=None: config.get(key, default)
+        self.command.send_text = send_text
+
+    async def asyncTearDown(self):
+        await plugin.status_watcher.stop()
+        await plugin.connection_pool.stop()
+        await self.server.close()
+
+    async def test_waits_on_shared_watcher_until_success(self):
+        result = await self.command.execute()
+        self.assertEqual(result, (True, "歌词生成完成", 1))
+        self.assertEqual(self.sent[1:], ["⏳ 歌词生成中，进度：50%", "📝 歌词生成完成！任务ID：task-9"])
+
+
+if __name__ == "__main__":
+    unittest.main()